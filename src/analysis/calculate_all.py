@@ -1,49 +1,73 @@
 """Calculate GDI for all networks"""
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from simple_metrics import calculate_gdi
-import json
+from data_ingestion import read_node_csv
+from json_utils import write_json
+
+# Columns used by simple_metrics.calculate_gdi
+columns = {
+    'lat': 'float64',
+    'lon': 'float64',
+    'country': str,
+    'org': str,
+    'asname': str,
+    'isp': str,
+    'hosting': str,
+}
 
 networks = {
     'ethereum': '../../data/raw/2025-11-22-ethereum-ips.csv',
     'polygon': '../../data/raw/2025-11-22-polygon-ips.csv',
 }
 
-results = {}
 
-for network_name, filepath in networks.items():
-    try:
-        df = pd.read_csv(filepath)
-        df = df.dropna(subset=['lat', 'lon'])
+def process(filepath):
+    """Load one network's nodes and compute its GDI"""
+    df = read_node_csv(filepath, columns)
+    df = df.dropna(subset=['lat', 'lon'])
+    return calculate_gdi(df)
 
-        result = calculate_gdi(df)
-        results[network_name] = result
 
-        print(f"\n{'='*60}")
-        print(f"GDI v0 Results - {network_name.title()}")
-        print(f"{'='*60}")
-        print(f"\nOverall GDI: {result['gdi']} - {result['interpretation']}")
-        print(f"Total Nodes: {result['total_nodes']:,}")
+# Networks are independent, so load and score them concurrently
+with ThreadPoolExecutor(max_workers=len(networks)) as executor:
+    futures = {
+        network_name: executor.submit(process, filepath)
+        for network_name, filepath in networks.items()
+    }
 
-        print(f"\n{'Physical Distribution (PDI)':-^60}")
-        print(f"  Score: {result['pdi']['pdi']} - {result['pdi']['interpretation']}")
-        print(f"  Spatial HHI: {result['pdi']['spatial_hhi']}")
-
-        print(f"\n{'Jurisdictional Diversity (JDI)':-^60}")
-        print(f"  Score: {result['jdi']['jdi']} - {result['jdi']['interpretation']}")
-        print(f"  Countries: {result['jdi']['effective_countries']}/{result['jdi']['num_countries']}")
-        print(f"  Top country: {list(result['jdi']['top_3_countries'].keys())[0]}")
-
-        print(f"\n{'Infrastructure Heterogeneity (IHI)':-^60}")
-        print(f"  Score: {result['ihi']['ihi']} - {result['ihi']['interpretation']}")
-        print(f"  Provider HHI: {result['ihi']['provider_hhi']}")
+results = {}
 
+# Report in submission order so output stays deterministic
+for network_name, future in futures.items():
+    try:
+        result = future.result()
     except FileNotFoundError:
         print(f"\nSkipping {network_name} - file not found")
         continue
 
+    results[network_name] = result
+
+    print(f"\n{'='*60}")
+    print(f"GDI v0 Results - {network_name.title()}")
+    print(f"{'='*60}")
+    print(f"\nOverall GDI: {result['gdi']} - {result['interpretation']}")
+    print(f"Total Nodes: {result['total_nodes']:,}")
+
+    print(f"\n{'Physical Distribution (PDI)':-^60}")
+    print(f"  Score: {result['pdi']['pdi']} - {result['pdi']['interpretation']}")
+    print(f"  Spatial HHI: {result['pdi']['spatial_hhi']}")
+
+    print(f"\n{'Jurisdictional Diversity (JDI)':-^60}")
+    print(f"  Score: {result['jdi']['jdi']} - {result['jdi']['interpretation']}")
+    print(f"  Countries: {result['jdi']['effective_countries']}/{result['jdi']['num_countries']}")
+    print(f"  Top country: {list(result['jdi']['top_3_countries'].keys())[0]}")
+
+    print(f"\n{'Infrastructure Heterogeneity (IHI)':-^60}")
+    print(f"  Score: {result['ihi']['ihi']} - {result['ihi']['interpretation']}")
+    print(f"  Provider HHI: {result['ihi']['provider_hhi']}")
+
 print(f"\n{'='*60}\n")
 
 # Save to JSON for frontend
-with open('../../data/gdi_results.json', 'w') as f:
-    json.dump(results, f, indent=2)
-    print("Results saved to data/gdi_results.json")
+write_json('../../data/gdi_results.json', results)
+print("Results saved to data/gdi_results.json")
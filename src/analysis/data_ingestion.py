@@ -6,11 +6,16 @@ from various sources (Bitnodes, Ethernodes, etc.)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from pathlib import Path
 import logging
+import os
+from operator import attrgetter
 import geopandas as gpd
-from shapely.geometry import Point
+import numpy as np
 import pandas as pd
 
 try:
@@ -20,6 +25,29 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Prefer pyogrio over fiona for vector I/O when it is installed
+try:
+    import pyogrio  # noqa: F401
+    gpd.options.io_engine = "pyogrio"
+except ImportError:
+    pass
+
+# NodeLocation fields exported as GeoDataFrame columns
+NODE_COLUMNS = (
+    'node_id', 'network', 'latitude', 'longitude', 'country',
+    'city', 'asn', 'isp', 'cloud_provider'
+)
+
+# Columns read from node CSV exports and their parse dtypes
+CSV_COLUMNS = {
+    'lat': 'float64',
+    'lon': 'float64',
+    'country': str,
+    'city': str,
+    'isp': str,
+    'org': str,
+}
+
 
 class DataIngestionError(Exception):
     """Raised when data ingestion fails"""
@@ -31,11 +59,28 @@ class BitnodesIngestion:
 
     BASE_URL = "https://bitnodes.io/api/v1"
 
+    _session: Optional[requests.Session] = None
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
-        self.session = requests.Session()
-        if api_key:
-            self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+        self.session = self._get_session()
+        # Auth is sent per request since the session is shared across instances
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Return a keep-alive session shared by all instances"""
+        if cls._session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504)
+            )
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            cls._session = session
+        return cls._session
 
     def fetch_snapshot(self) -> NetworkSnapshot:
         """
@@ -47,11 +92,15 @@ class BitnodesIngestion:
         try:
             response = self.session.get(
                 f"{self.BASE_URL}/snapshots/latest/",
+                headers=self.headers,
                 timeout=30
             )
             response.raise_for_status()
             data = response.json()
 
+            # All nodes in a snapshot share one timestamp
+            timestamp = datetime.utcnow()
+
             nodes = []
             for node_id, node_data in data.get("nodes", {}).items():
                 # Bitnodes format: [protocol_version, user_agent, timestamp,
@@ -65,21 +114,24 @@ class BitnodesIngestion:
                     if lat is None or lon is None:
                         continue
 
+                    # asn/org are trailing fields and may be missing
+                    asn, isp = (list(node_data[11:13]) + [None, None])[:2]
+
                     nodes.append(NodeLocation(
                         node_id=node_id,
                         network="bitcoin",
                         latitude=float(lat),
                         longitude=float(lon),
-                        city=node_data[6] if len(node_data) > 6 else None,
-                        country=node_data[7] if len(node_data) > 7 else None,
-                        asn=node_data[11] if len(node_data) > 11 else None,
-                        isp=node_data[12] if len(node_data) > 12 else None,
-                        timestamp=datetime.utcnow()
+                        city=node_data[6],
+                        country=node_data[7],
+                        asn=asn,
+                        isp=isp,
+                        timestamp=timestamp
                     ))
 
             return NetworkSnapshot(
                 network="bitcoin",
-                timestamp=datetime.utcnow(),
+                timestamp=timestamp,
                 nodes=nodes
             )
 
@@ -92,11 +144,44 @@ class BitnodesIngestion:
 class MockDataGenerator:
     """Generate mock node data for testing"""
 
+    # Major city centers as cluster locations
+    CLUSTER_CENTERS = [
+        (40.7128, -74.0060),   # New York
+        (51.5074, -0.1278),    # London
+        (35.6762, 139.6503),   # Tokyo
+        (37.7749, -122.4194),  # San Francisco
+        (52.5200, 13.4050),    # Berlin
+    ]
+
+    @staticmethod
+    def _clustered_layout(
+        num_nodes: int,
+        num_clusters: int,
+        seed: Optional[int]
+    ) -> tuple:
+        """
+        Cluster index, index within cluster, latitude and longitude per node
+
+        Shared by both generators so the same seed yields the same nodes.
+        """
+        centers = np.array(MockDataGenerator.CLUSTER_CENTERS[:num_clusters])
+        nodes_per_cluster = num_nodes // num_clusters
+
+        # Random offsets (approx ±100km) for every node, drawn in one call
+        rng = np.random.default_rng(seed)
+        offsets = rng.standard_normal((len(centers), nodes_per_cluster, 2))
+        coords = (centers[:, np.newaxis, :] + offsets).reshape(-1, 2)
+
+        cluster = np.repeat(np.arange(len(centers)), nodes_per_cluster)
+        member = np.tile(np.arange(nodes_per_cluster), len(centers))
+        return cluster, member, coords[:, 0], coords[:, 1]
+
     @staticmethod
     def generate_clustered_nodes(
         network: str,
         num_nodes: int = 100,
-        num_clusters: int = 5
+        num_clusters: int = 5,
+        seed: Optional[int] = None
     ) -> NetworkSnapshot:
         """
         Generate mock nodes with realistic clustering
@@ -105,46 +190,77 @@ class MockDataGenerator:
             network: Network name (e.g., 'ethereum')
             num_nodes: Total number of nodes to generate
             num_clusters: Number of geographic clusters
+            seed: Optional seed for reproducible node placement
 
         Returns:
             NetworkSnapshot with generated nodes
         """
-        import numpy as np
-
-        # Major city centers as cluster locations
-        cluster_centers = [
-            (40.7128, -74.0060),   # New York
-            (51.5074, -0.1278),    # London
-            (35.6762, 139.6503),   # Tokyo
-            (37.7749, -122.4194),  # San Francisco
-            (52.5200, 13.4050),    # Berlin
-        ][:num_clusters]
-
-        nodes = []
-        nodes_per_cluster = num_nodes // num_clusters
-
-        for i, (lat_center, lon_center) in enumerate(cluster_centers):
-            for j in range(nodes_per_cluster):
-                # Add random offset (approx ±100km)
-                lat = lat_center + np.random.normal(0, 1.0)
-                lon = lon_center + np.random.normal(0, 1.0)
-
-                nodes.append(NodeLocation(
-                    node_id=f"{network}_node_{i}_{j}",
-                    network=network,
-                    latitude=lat,
-                    longitude=lon,
-                    country=f"Country_{i}",
-                    city=f"City_{i}",
-                    timestamp=datetime.utcnow()
-                ))
+        cluster, member, lats, lons = MockDataGenerator._clustered_layout(
+            num_nodes, num_clusters, seed
+        )
+        timestamp = datetime.utcnow()
+
+        nodes = [
+            NodeLocation(
+                node_id=f"{network}_node_{i}_{j}",
+                network=network,
+                latitude=lat,
+                longitude=lon,
+                country=f"Country_{i}",
+                city=f"City_{i}",
+                timestamp=timestamp
+            )
+            for i, j, lat, lon in zip(cluster.tolist(), member.tolist(), lats.tolist(), lons.tolist())
+        ]
 
         return NetworkSnapshot(
             network=network,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             nodes=nodes
         )
 
+    @staticmethod
+    def generate_clustered_gdf(
+        network: str,
+        num_nodes: int = 100,
+        num_clusters: int = 5,
+        seed: Optional[int] = None
+    ) -> gpd.GeoDataFrame:
+        """
+        Generate clustered mock nodes directly as a GeoDataFrame
+
+        Same nodes as snapshot_to_geodataframe(generate_clustered_nodes(...))
+        for the same seed, without building NodeLocation objects in between.
+
+        Args:
+            network: Network name (e.g., 'ethereum')
+            num_nodes: Total number of nodes to generate
+            num_clusters: Number of geographic clusters
+            seed: Optional seed for reproducible node placement
+
+        Returns:
+            GeoDataFrame with generated nodes
+        """
+        cluster, member, lats, lons = MockDataGenerator._clustered_layout(
+            num_nodes, num_clusters, seed
+        )
+
+        return gpd.GeoDataFrame(
+            {
+                'node_id': [f"{network}_node_{i}_{j}" for i, j in zip(cluster, member)],
+                'network': network,
+                'latitude': lats,
+                'longitude': lons,
+                'country': [f"Country_{i}" for i in cluster],
+                'city': [f"City_{i}" for i in cluster],
+                'asn': None,
+                'isp': None,
+                'cloud_provider': None,
+            },
+            geometry=gpd.points_from_xy(lons, lats),
+            crs='EPSG:4326'
+        )
+
 
 def snapshot_to_geodataframe(snapshot: NetworkSnapshot) -> gpd.GeoDataFrame:
     """
@@ -156,65 +272,209 @@ def snapshot_to_geodataframe(snapshot: NetworkSnapshot) -> gpd.GeoDataFrame:
     Returns:
         GeoDataFrame with Point geometries
     """
-    data = []
-    for node in snapshot.nodes:
-        data.append({
-            'node_id': node.node_id,
-            'network': node.network,
-            'latitude': node.latitude,
-            'longitude': node.longitude,
-            'country': node.country,
-            'city': node.city,
-            'asn': node.asn,
-            'isp': node.isp,
-            'cloud_provider': node.cloud_provider,
-            'geometry': Point(node.longitude, node.latitude)
-        })
-
-    gdf = gpd.GeoDataFrame(data, crs='EPSG:4326')
+    # Transpose nodes into columns in a single pass (one tuple per node
+    # rather than one dict per node)
+    getter = attrgetter(*NODE_COLUMNS)
+    values = zip(*map(getter, snapshot.nodes))
+    columns = {
+        name: list(column)
+        for name, column in zip(NODE_COLUMNS, values)
+    } if snapshot.nodes else {name: [] for name in NODE_COLUMNS}
+
+    # Coordinates as contiguous arrays so geometries are built in a single
+    # vectorized call rather than one Point() per node
+    lats = np.asarray(columns['latitude'], dtype='f8')
+    lons = np.asarray(columns['longitude'], dtype='f8')
+    columns['latitude'] = lats
+    columns['longitude'] = lons
+
+    df = pd.DataFrame(columns)
+    df['geometry'] = gpd.points_from_xy(lons, lats)
+
+    gdf = gpd.GeoDataFrame(df, crs='EPSG:4326')
     return gdf
 
 
-def load_from_csv(csv_path: str, network: str = "ethereum") -> gpd.GeoDataFrame:
+def read_node_csv(
+    csv_path: str,
+    columns: Optional[Dict[str, Any]] = None,
+    chunksize: Optional[int] = None
+) -> pd.DataFrame:
     """
-    Load node data from CSV file
+    Read a node CSV, parsing only the columns needed downstream
+
+    Uses pyarrow's multithreaded parser when available and falls back to
+    the default C engine otherwise.
 
     Args:
-        csv_path: Path to CSV file with columns: ip, lat, lon, country, city, isp, etc.
-        network: Network name
+        csv_path: Path to CSV file
+        columns: Mapping of column name to dtype (defaults to CSV_COLUMNS).
+            Columns absent from the file are skipped.
+        chunksize: If set, stream the file in chunks of this many rows and
+            drop rows without coordinates as each chunk is read. Bounds
+            parser memory for very large exports.
 
     Returns:
-        GeoDataFrame with node locations
+        DataFrame with the requested columns that exist in the file
     """
-    from pathlib import Path
+    columns = CSV_COLUMNS if columns is None else columns
 
-    df = pd.read_csv(csv_path)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtype = {col: t for col, t in columns.items() if col in header}
 
+    if chunksize is not None:
+        # pyarrow engine does not support chunked reads
+        reader = pd.read_csv(csv_path, usecols=list(dtype), dtype=dtype, chunksize=chunksize)
+        chunks = [chunk.dropna(subset=['lat', 'lon']) for chunk in reader]
+        if not chunks:
+            # Header-only file: return the same empty frame as a full read
+            return pd.read_csv(csv_path, usecols=list(dtype), dtype=dtype, nrows=0)
+        return pd.concat(chunks)
+
+    try:
+        return pd.read_csv(csv_path, usecols=list(dtype), dtype=dtype, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(csv_path, usecols=list(dtype), dtype=dtype)
+
+
+def _frame_to_geodataframe(df: pd.DataFrame, network: str) -> gpd.GeoDataFrame:
+    """
+    Convert a raw node table (lat, lon, country, ...) to a GeoDataFrame
+
+    Builds the same columns as snapshot_to_geodataframe directly from the
+    table, without materializing a NodeLocation per row.
+    """
     # Filter out rows without coordinates
     df = df.dropna(subset=['lat', 'lon'])
 
-    # Convert to NodeLocation objects
-    nodes = []
-    for idx, row in df.iterrows():
-        nodes.append(NodeLocation(
-            node_id=f"{network}_node_{idx}",
-            network=network,
-            latitude=float(row['lat']),
-            longitude=float(row['lon']),
-            country=row.get('country') if pd.notna(row.get('country')) else None,
-            city=row.get('city') if pd.notna(row.get('city')) else None,
-            isp=row.get('isp') if pd.notna(row.get('isp')) else None,
-            cloud_provider=row.get('org') if pd.notna(row.get('org')) else None,
-            timestamp=datetime.utcnow()
-        ))
-
-    snapshot = NetworkSnapshot(
-        network=network,
-        timestamp=datetime.utcnow(),
-        nodes=nodes
+    lats = df['lat'].to_numpy(dtype='f8')
+    lons = df['lon'].to_numpy(dtype='f8')
+
+    # Same bounds NodeLocation enforces, checked for all rows at once
+    invalid = ~((np.abs(lats) <= 90) & (np.abs(lons) <= 180))
+    if invalid.any():
+        raise DataIngestionError(
+            f"{int(invalid.sum())} rows have out-of-range coordinates"
+        )
+
+    def optional(column: str):
+        return df[column].to_numpy() if column in df.columns else None
+
+    gdf = gpd.GeoDataFrame(
+        {
+            'node_id': (f"{network}_node_" + df.index.astype(str)).to_numpy(),
+            'network': network,
+            'latitude': lats,
+            'longitude': lons,
+            'country': optional('country'),
+            'city': optional('city'),
+            'asn': None,
+            'isp': optional('isp'),
+            'cloud_provider': optional('org'),
+        },
+        geometry=gpd.points_from_xy(lons, lats),
+        crs='EPSG:4326'
     )
+    return gdf
+
+
+def load_from_parquet(parquet_path: str, network: str = "ethereum") -> gpd.GeoDataFrame:
+    """
+    Load node data from a Parquet file
+
+    Args:
+        parquet_path: Path to Parquet file with the same columns as the CSV exports
+        network: Network name
+
+    Returns:
+        GeoDataFrame with node locations
+    """
+    import pyarrow.parquet as pq
+
+    available = pq.read_schema(parquet_path).names
+    columns = [col for col in CSV_COLUMNS if col in available]
+    df = pd.read_parquet(parquet_path, columns=columns, engine='pyarrow')
 
-    return snapshot_to_geodataframe(snapshot)
+    return _frame_to_geodataframe(df, network)
+
+
+# df.attrs key recording which CSV (size, mtime) a Parquet cache was built from
+CACHE_SOURCE_KEY = 'source_csv'
+
+
+def _csv_fingerprint(csv_path: Path) -> str:
+    """Size and modification time (ns) of a CSV, identifying one version of it"""
+    stat = csv_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _read_csv_cache(cache_path: Path, csv_path: Path) -> Optional[pd.DataFrame]:
+    """
+    Parsed CSV columns from a Parquet cache, or None if unusable
+
+    The cache is only used when it was built from the current version of
+    the CSV. Any failure to read it (missing, partial or corrupt file, no
+    pyarrow) falls back to parsing the CSV.
+    """
+    if not cache_path.exists():
+        return None
+    try:
+        df = pd.read_parquet(cache_path, engine='pyarrow')
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable Parquet cache {cache_path}: {e}")
+        return None
+    if df.attrs.get(CACHE_SOURCE_KEY) != _csv_fingerprint(csv_path):
+        return None
+    return df
+
+
+def _write_csv_cache(df: pd.DataFrame, cache_path: Path, csv_path: Path) -> None:
+    """Write a Parquet cache atomically (temp file + rename) next to the CSV"""
+    cached = df.copy(deep=False)
+    cached.attrs[CACHE_SOURCE_KEY] = _csv_fingerprint(csv_path)
+
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cached.to_parquet(tmp_path, engine='pyarrow')
+        os.replace(tmp_path, cache_path)
+    except (ImportError, OSError) as e:
+        logger.debug(f"Not caching {csv_path} as Parquet: {e}")
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_from_csv(
+    csv_path: str,
+    network: str = "ethereum",
+    chunksize: Optional[int] = None,
+    cache: bool = False
+) -> gpd.GeoDataFrame:
+    """
+    Load node data from CSV file
+
+    Args:
+        csv_path: Path to CSV file with columns: ip, lat, lon, country, city, isp, etc.
+        network: Network name
+        chunksize: Optional number of rows per chunk for streaming large files
+        cache: If True, keep the parsed columns in a sibling .parquet file and
+            reuse it on later calls while the CSV is unchanged (same size and
+            mtime). Only applies to whole-file reads; chunked reads always
+            stream the CSV.
+
+    Returns:
+        GeoDataFrame with node locations
+    """
+    csv_path = Path(csv_path)
+    cache_path = csv_path.with_suffix('.parquet')
+    use_cache = cache and chunksize is None
+
+    df = _read_csv_cache(cache_path, csv_path) if use_cache else None
+    if df is None:
+        df = read_node_csv(str(csv_path), chunksize=chunksize)
+        if use_cache:
+            _write_csv_cache(df, cache_path, csv_path)
+
+    return _frame_to_geodataframe(df, network)
 
 
 def load_sample_data(network: str = "ethereum", use_real_data: bool = True) -> gpd.GeoDataFrame:
@@ -228,8 +488,6 @@ def load_sample_data(network: str = "ethereum", use_real_data: bool = True) -> g
     Returns:
         GeoDataFrame with sample node data
     """
-    from pathlib import Path
-
     if use_real_data:
         # Try to find real data files
         project_root = Path(__file__).parent.parent.parent
@@ -238,18 +496,21 @@ def load_sample_data(network: str = "ethereum", use_real_data: bool = True) -> g
         # Look for network-specific CSV files
         pattern = f"*{network}*.csv"
         csv_files = list(data_dir.glob(pattern))
+        parquet_files = list(data_dir.glob(f"*{network}*.parquet"))
 
         if csv_files:
             logger.info(f"Loading real data from {csv_files[0]}")
             return load_from_csv(str(csv_files[0]), network=network)
+        elif parquet_files:
+            logger.info(f"Loading real data from {parquet_files[0]}")
+            return load_from_parquet(str(parquet_files[0]), network=network)
         else:
             logger.warning(f"No real data found for {network}, generating mock data")
 
     # Fallback to mock data
     generator = MockDataGenerator()
-    snapshot = generator.generate_clustered_nodes(
+    return generator.generate_clustered_gdf(
         network=network,
         num_nodes=200,
         num_clusters=5
     )
-    return snapshot_to_geodataframe(snapshot)
@@ -9,14 +9,15 @@ Demonstrates the complete workflow:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import json
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from data_ingestion import load_sample_data
+from json_utils import write_json
 from spatial_metrics import SpatialAnalyzer
 from visualization import (
     plot_node_distribution_map,
@@ -55,7 +56,7 @@ def main():
 
     # Hash input characteristics + parameters
     input_hash_data = f"ethereum_{len(gdf)}nodes_{params['threshold_km']}km_h3res{params['h3_resolution']}"
-    run_hash = hashlib.md5(input_hash_data.encode()).hexdigest()[:8]
+    run_hash = hashlib.blake2b(input_hash_data.encode(), digest_size=4).hexdigest()
 
     # Use descriptive name with hash to prevent duplicates
     run_name = f"ethereum_{len(gdf)}nodes_500km_h3-5_{run_hash}"
@@ -94,37 +95,48 @@ def main():
         "columns": list(gdf.columns)
     }
 
-    with open(output_dir / "input" / "metadata.json", 'w') as f:
-        json.dump(input_metadata, f, indent=2)
+    write_json(output_dir / "input" / "metadata.json", input_metadata)
     logger.info(f"Saved input metadata to {output_dir / 'input' / 'metadata.json'}")
 
     # Save input data sample (first 100 rows)
-    gdf.head(100).to_file(
+    write_json(
         output_dir / "input" / "sample_nodes.geojson",
-        driver='GeoJSON'
+        gdf.head(100).to_geo_dict(drop_id=True),
+        indent=False
     )
     logger.info(f"Saved input sample to {output_dir / 'input' / 'sample_nodes.geojson'}")
 
-    # Initialize analyzer
-    logger.info("Initializing spatial analyzer...")
-    analyzer = SpatialAnalyzer(gdf)
-
-    # Save code used for this analysis
+    # Save code used for this analysis. The copies are I/O-bound, so they run
+    # on background threads while the analyzer is initialized.
     import shutil
     code_files = [
         "data_ingestion.py",
         "spatial_metrics.py",
+        "spatial_weights.py",
+        "h3_index.py",
         "visualization.py",
         "models.py",
         "demo.py",
+        "json_utils.py",
         "requirements.txt"
     ]
 
     analysis_dir = Path(__file__).parent
-    for code_file in code_files:
-        src = analysis_dir / code_file
-        if src.exists():
-            shutil.copy(src, output_dir / "code" / code_file)
+    with ThreadPoolExecutor() as copy_executor:
+        copies = [
+            copy_executor.submit(
+                shutil.copyfile, analysis_dir / code_file, output_dir / "code" / code_file
+            )
+            for code_file in code_files
+            if (analysis_dir / code_file).exists()
+        ]
+
+        # Initialize analyzer
+        logger.info("Initializing spatial analyzer...")
+        analyzer = SpatialAnalyzer(gdf)
+
+    for copy_future in copies:
+        copy_future.result()  # Surface any copy errors
 
     logger.info(f"Saved code snapshot to {output_dir / 'code'}")
 
@@ -138,8 +150,7 @@ def main():
         "code_files": code_files
     }
 
-    with open(output_dir / "code" / "run_config.json", 'w') as f:
-        json.dump(run_config, f, indent=2)
+    write_json(output_dir / "code" / "run_config.json", run_config)
 
     # Compute all metrics
     logger.info("Computing spatial metrics...")
@@ -186,8 +197,7 @@ def main():
     }
 
     json_path = output_dir / "output" / "results.json"
-    with open(json_path, 'w') as f:
-        json.dump(results_json, f, indent=2)
+    write_json(json_path, results_json)
     logger.info(f"Saved: {json_path}")
 
     # Create detailed output metadata
@@ -209,8 +219,7 @@ def main():
         ]
     }
 
-    with open(output_dir / "output" / "metadata.json", 'w') as f:
-        json.dump(output_metadata, f, indent=2)
+    write_json(output_dir / "output" / "metadata.json", output_metadata)
     logger.info(f"Saved: {output_dir / 'output' / 'metadata.json'}")
 
     # Create README for this run
@@ -256,9 +265,12 @@ def main():
 │   ├── run_config.json        # Analysis parameters
 │   ├── data_ingestion.py      # Code snapshot
 │   ├── spatial_metrics.py     # Code snapshot
+│   ├── spatial_weights.py     # Code snapshot
+│   ├── h3_index.py            # Code snapshot
 │   ├── visualization.py       # Code snapshot
 │   ├── models.py              # Code snapshot
 │   ├── demo.py                # Code snapshot
+│   ├── json_utils.py          # Code snapshot
 │   └── requirements.txt       # Dependencies
 └── output/
     ├── results.json           # Full metric results
@@ -5,15 +5,62 @@ All metrics 0-100, higher = more decentralized
 
 import numpy as np
 import pandas as pd
-import geopandas as gpd
-from typing import Dict
-from shapely.geometry import Point
+import weakref
+from typing import TYPE_CHECKING, Dict, Optional
+from scipy.special import xlogy
 
-# Import existing spatial analyzer for PDI
-from spatial_metrics import SpatialAnalyzer
+# geopandas and SpatialAnalyzer (which pulls in scikit-learn) are imported inside the PDI
+# code paths so JDI/IHI-only callers don't pay for them at import time
+if TYPE_CHECKING:
+    import geopandas as gpd
 
+# Optional: dictionary-encoded category counts (falls back to pd.factorize)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
-def calculate_pdi(df: pd.DataFrame, threshold_km: float = 500.0, h3_resolution: int = 5) -> Dict:
+try:
+    from .h3_index import points_to_h3_uint64
+except ImportError:
+    from h3_index import points_to_h3_uint64
+
+
+def _to_geodataframe(lat: np.ndarray, lon: np.ndarray) -> 'gpd.GeoDataFrame':
+    """Build the point GeoDataFrame SpatialAnalyzer expects from lat/lon arrays"""
+    import geopandas as gpd
+
+    geometry = gpd.points_from_xy(lon, lat, crs='EPSG:4326')
+    gdf = gpd.GeoDataFrame(geometry=geometry)
+    gdf['network'] = 'network'  # Required by SpatialAnalyzer
+    return gdf
+
+
+def _h3_cell_counts(gdf: 'gpd.GeoDataFrame', resolution: int) -> np.ndarray:
+    """
+    Histogram of nodes per occupied H3 cell
+
+    Shared by Spatial HHI and ENL so cells are assigned only once.
+
+    Args:
+        gdf: Point GeoDataFrame in EPSG:4326
+        resolution: H3 resolution
+
+    Returns:
+        Node count per occupied cell
+    """
+    cells = points_to_h3_uint64(gdf.geometry.y.to_numpy(), gdf.geometry.x.to_numpy(), resolution)
+    codes, _ = pd.factorize(cells)
+    return np.bincount(codes)
+
+
+def calculate_pdi(
+    df: Optional[pd.DataFrame] = None,
+    threshold_km: float = 500.0,
+    h3_resolution: int = 5,
+    *,
+    gdf: Optional['gpd.GeoDataFrame'] = None
+) -> Dict:
     """
     Physical Distribution Index - Composite spatial metric
 
@@ -22,36 +69,50 @@ def calculate_pdi(df: pd.DataFrame, threshold_km: float = 500.0, h3_resolution:
     Higher = more dispersed, less clustered
 
     Args:
-        df: DataFrame with 'lat', 'lon' columns
+        df: DataFrame with 'lat', 'lon' columns (omit when gdf is given)
         threshold_km: Distance threshold for Moran's I spatial weights
         h3_resolution: H3 grid resolution for HHI/ENL
+        gdf: Prebuilt point GeoDataFrame, used instead of df when given
 
     Returns:
         Dict with pdi score and component metrics
     """
-    # Create GeoDataFrame
-    geometry = [Point(xy) for xy in zip(df['lon'], df['lat'])]
-    gdf = gpd.GeoDataFrame(df, geometry=geometry, crs='EPSG:4326')
-    gdf['network'] = 'network'  # Required by SpatialAnalyzer
-
     # Use existing spatial analyzer
+    from spatial_metrics import SpatialAnalyzer
+
+    if gdf is None:
+        if df is None:
+            raise ValueError("calculate_pdi needs either df or gdf")
+        gdf = _to_geodataframe(df['lat'].to_numpy(), df['lon'].to_numpy())
+
     analyzer = SpatialAnalyzer(gdf)
 
     # Calculate components
+    # Moran's I on local node density; the distance-band weights are
+    # cached per coordinate set for repeated runs
     morans_result = analyzer.morans_i(threshold_km=threshold_km)
-    hhi_result = analyzer.spatial_hhi(resolution=h3_resolution)
-    enl_result = analyzer.effective_num_locations(resolution=h3_resolution)
+    morans_i, morans_p = morans_result.value, morans_result.p_value
+
+    # Spatial HHI and ENL from one H3 cell histogram
+    cell_counts = _h3_cell_counts(gdf, h3_resolution)
+    total_cells = len(cell_counts)
+    p = cell_counts / cell_counts.sum()
+    spatial_hhi = (p ** 2).sum()
+    enl = np.exp(-xlogy(p, p).sum())
+
+    # PDI fields are plain floats, so they round with Python's round()
+    morans_i, morans_p, spatial_hhi, enl = map(float, (morans_i, morans_p, spatial_hhi, enl))
 
     # Normalize components to 0-1
     # Moran's I: ranges -1 to +1, but typically 0 to +1 for real data
     # Invert: high clustering (high I) = low score
-    morans_normalized = max(0, min(1, (1 - morans_result.value)))
+    morans_normalized = max(0, min(1, (1 - morans_i)))
 
     # ENL: normalize by total cells
-    enl_normalized = enl_result.value / enl_result.total_locations
+    enl_normalized = enl / total_cells
 
     # Spatial HHI: already 0-1, invert
-    spatial_hhi_normalized = 1 - hhi_result.value
+    spatial_hhi_normalized = 1 - spatial_hhi
 
     # Weighted composite (all components now 0-1)
     pdi = 100 * (
@@ -62,11 +123,11 @@ def calculate_pdi(df: pd.DataFrame, threshold_km: float = 500.0, h3_resolution:
 
     return {
         'pdi': round(pdi, 1),
-        'morans_i': round(morans_result.value, 3),
-        'morans_p_value': round(morans_result.p_value, 4),
-        'spatial_hhi': round(hhi_result.value, 3),
-        'enl': round(enl_result.value, 1),
-        'total_cells': enl_result.total_locations,
+        'morans_i': round(morans_i, 3),
+        'morans_p_value': round(morans_p, 4),
+        'spatial_hhi': round(spatial_hhi, 3),
+        'enl': round(enl, 1),
+        'total_cells': total_cells,
         'interpretation': _interpret_pdi(pdi),
         'components': {
             'morans_contribution': round(0.4 * morans_normalized * 100, 1),
@@ -76,6 +137,100 @@ def calculate_pdi(df: pd.DataFrame, threshold_km: float = 500.0, h3_resolution:
     }
 
 
+# Dictionary encodings of Arrow-backed columns, keyed on id() of the
+# (immutable) Arrow data; entries are dropped when that data is freed
+_encoding_cache: Dict[int, tuple] = {}
+
+
+def _encode_categories(values) -> tuple:
+    """
+    Integer codes and labels for a categorical column
+
+    Arrow-backed columns are dictionary-encoded with pyarrow and the result
+    is cached for as long as the column's Arrow data lives, so repeated
+    JDI/IHI runs on the same snapshot skip re-hashing the strings. Other
+    inputs fall back to pd.factorize.
+
+    Args:
+        values: Categorical column or array (e.g. 'country', 'org')
+
+    Returns:
+        (codes, labels) with code -1 for missing values
+    """
+    to_arrow = getattr(getattr(values, 'array', None), '__arrow_array__', None)
+    if pa is None or to_arrow is None:
+        codes, labels = pd.factorize(values)
+        return codes, np.asarray(labels)
+
+    data = to_arrow()
+    key = id(data)
+    cached = _encoding_cache.get(key)
+    if cached is not None and cached[0]() is data:
+        return cached[1], cached[2]
+
+    encoded = data.combine_chunks().dictionary_encode()
+    codes = encoded.indices.fill_null(-1).to_numpy().astype(np.int64)
+    labels = encoded.dictionary.to_numpy(zero_copy_only=False)
+    codes.flags.writeable = False  # Shared between callers via the cache
+    labels.flags.writeable = False
+    _encoding_cache[key] = (weakref.ref(data), codes, labels)
+    weakref.finalize(data, _encoding_cache.pop, key, None)
+    return codes, labels
+
+
+def _category_counts(values, mask: Optional[np.ndarray] = None) -> tuple:
+    """
+    Count occurrences of each category
+
+    Labels are dictionary-encoded once (see _encode_categories) and counted
+    with np.bincount on the integer codes.
+
+    Args:
+        values: Categorical column or array (e.g. 'country', 'org')
+        mask: Optional boolean row mask applied before counting
+
+    Returns:
+        (labels, counts) arrays, in order of first appearance
+    """
+    codes, labels = _encode_categories(values)
+    if mask is not None:
+        codes = codes[mask]
+    codes = codes[codes >= 0]
+
+    counts = np.bincount(codes, minlength=len(labels))
+    if mask is None:
+        # Codes of a whole column are already in first-appearance order
+        return labels, counts
+
+    # Keep only categories present in the selected rows, ordered by where
+    # each first appears among them
+    present, first_seen = np.unique(codes, return_index=True)
+    order = present[np.argsort(first_seen)]
+    return labels[order], counts[order]
+
+
+def _top_indices(counts: np.ndarray, k: int = 3) -> np.ndarray:
+    """
+    Indices of the k largest counts, in value_counts order
+
+    Args:
+        counts: Count per category, in order of first appearance
+        k: Number of categories to return
+
+    Returns:
+        Array of up to k indices into counts
+    """
+    if len(counts) > k:
+        candidates = np.argpartition(-counts, k - 1)[:k]
+        # Pull in every category tied with the k-th largest count
+        candidates = np.flatnonzero(counts >= counts[candidates].min())
+    else:
+        candidates = np.arange(len(counts))
+    # Stable sort keeps ties in first-appearance order
+    order = np.argsort(-counts[candidates], kind='stable')
+    return candidates[order[:k]]
+
+
 def calculate_jdi(df: pd.DataFrame) -> Dict:
     """
     Jurisdictional Diversity Index - Country concentration via HHI
@@ -91,23 +246,45 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
         Dict with jdi score and metadata
     """
     # Country counts
-    country_counts = df['country'].value_counts()
-    total_nodes = len(df)
-    num_countries = len(country_counts)
+    countries, country_counts = _category_counts(df['country'])
+    return _jdi_from_counts(countries, country_counts, len(df))
 
-    # Calculate shares
-    shares = country_counts / total_nodes
 
-    # Country HHI = sum of squared shares
-    country_hhi = (shares ** 2).sum()
+def _concentration(labels: np.ndarray, counts: np.ndarray, total_nodes: int) -> tuple:
+    """
+    HHI and top-3 breakdown from one set of category counts
+
+    Args:
+        labels: Category labels, aligned with counts
+        counts: Node count per category
+        total_nodes: Node total the shares are taken against
+
+    Returns:
+        (hhi, top_3) where top_3 maps label -> {'count', 'share'}
+    """
+    # HHI = sum of squared shares; the integer dot product avoids a
+    # temporary squared-counts array. Kept as np.float64 so the derived
+    # scores (and the GDI composite) round like NumPy scalars.
+    counts = counts.astype(np.int64, copy=False)
+    hhi = np.float64(counts @ counts) / (total_nodes * total_nodes)
+
+    # Shares of plain ints, rounded with Python's round()
+    top_idx = _top_indices(counts)
+    top_3 = {k: {'count': v, 'share': round(v / total_nodes * 100, 1)}
+             for k, v in zip(labels[top_idx].tolist(), counts[top_idx].tolist())}
+    return hhi, top_3
+
+
+def _jdi_from_counts(countries: np.ndarray, country_counts: np.ndarray, total_nodes: int) -> Dict:
+    """JDI result from per-country node counts (see calculate_jdi)"""
+    num_countries = len(country_counts)
+
+    # Country HHI and top countries
+    country_hhi, top_3 = _concentration(countries, country_counts, total_nodes)
 
     # JDI = inverted (higher = less concentrated)
     jdi = 100 * (1 - country_hhi)
 
-    # Get top countries
-    top_3 = {k: {'count': v, 'share': round(v/total_nodes*100, 1)}
-             for k, v in country_counts.head(3).items()}
-
     return {
         'jdi': round(jdi, 1),
         'country_hhi': round(country_hhi, 3),
@@ -132,23 +309,20 @@ def calculate_ihi(df: pd.DataFrame) -> Dict:
         Dict with ihi score and metadata
     """
     # Org counts
-    org_counts = df['org'].value_counts()
-    total_nodes = len(df)
-    num_orgs = len(org_counts)
+    orgs, org_counts = _category_counts(df['org'])
+    return _ihi_from_counts(orgs, org_counts, len(df))
 
-    # Calculate shares
-    shares = org_counts / total_nodes
 
-    # Org HHI = sum of squared shares
-    org_hhi = (shares ** 2).sum()
+def _ihi_from_counts(orgs: np.ndarray, org_counts: np.ndarray, total_nodes: int) -> Dict:
+    """IHI result from per-org node counts (see calculate_ihi)"""
+    num_orgs = len(org_counts)
+
+    # Org HHI and top orgs
+    org_hhi, top_3 = _concentration(orgs, org_counts, total_nodes)
 
     # IHI = inverted (higher = less concentrated)
     ihi = 100 * (1 - org_hhi)
 
-    # Get top orgs
-    top_3 = {k: {'count': v, 'share': round(v/total_nodes*100, 1)}
-             for k, v in org_counts.head(3).items()}
-
     return {
         'ihi': round(ihi, 1),
         'org_hhi': round(org_hhi, 3),
@@ -169,13 +343,25 @@ def calculate_gdi(df: pd.DataFrame, weights: tuple = (0.4, 0.35, 0.25)) -> Dict:
     Returns:
         Dict with gdi score and all component metrics
     """
-    # Clean data
-    df = df.dropna(subset=['lat', 'lon', 'country', 'org'])
+    # Clean data: one row mask, then pull out only the columns each pillar
+    # needs instead of copying the whole frame
+    columns = ['lat', 'lon', 'country', 'org']
+    mask = df[columns].notna().all(axis=1).to_numpy()
+    lat = df['lat'].to_numpy(dtype=np.float64)[mask]
+    lon = df['lon'].to_numpy(dtype=np.float64)[mask]
+    total_nodes = len(lat)
+
+    # Build geometry once; only PDI needs it
+    gdf = _to_geodataframe(lat, lon)
 
     # Calculate components
-    pdi_result = calculate_pdi(df)
-    jdi_result = calculate_jdi(df)
-    ihi_result = calculate_ihi(df)
+    pdi_result = calculate_pdi(gdf=gdf)
+    jdi_result = _jdi_from_counts(
+        *_category_counts(df['country'], mask), total_nodes
+    )
+    ihi_result = _ihi_from_counts(
+        *_category_counts(df['org'], mask), total_nodes
+    )
 
     # Composite score
     w_pdi, w_jdi, w_ihi = weights
@@ -184,53 +370,71 @@ def calculate_gdi(df: pd.DataFrame, weights: tuple = (0.4, 0.35, 0.25)) -> Dict:
            w_ihi * ihi_result['ihi'])
 
     return {
-        'gdi': round(gdi, 1),
+        # np.round on purpose: the composite has always rounded like a
+        # NumPy scalar, which differs from round() on exact ties
+        'gdi': np.round(gdi, 1),
         'pdi': pdi_result,
         'jdi': jdi_result,
         'ihi': ihi_result,
         'weights': {'pdi': w_pdi, 'jdi': w_jdi, 'ihi': w_ihi},
         'interpretation': _interpret_gdi(gdi),
-        'total_nodes': len(df)
+        'total_nodes': total_nodes
     }
 
 
-def _interpret_pdi(pdi: float) -> str:
-    """Interpret PDI score"""
-    if pdi >= 80:
-        return "Highly dispersed"
-    elif pdi >= 60:
-        return "Moderately dispersed"
-    else:
-        return "Concentrated"
+# Interpretation bands: labels[i] applies to bins[i-1] <= score < bins[i]
+PDI_BINS = np.array([60, 80])
+PDI_LABELS = np.array(["Concentrated", "Moderately dispersed", "Highly dispersed"], dtype=object)
+HHI_BASED_BINS = np.array([25, 50, 75])
+HHI_BASED_LABELS = np.array([
+    "Very high concentration", "High concentration",
+    "Moderate concentration", "Low concentration"
+], dtype=object)
+GDI_BINS = np.array([40, 60, 80])
+GDI_LABELS = np.array([
+    "Centralized", "Weakly decentralized",
+    "Moderately decentralized", "Highly decentralized"
+], dtype=object)
+
+
+def _interpret(score, bins: np.ndarray, labels: np.ndarray):
+    """
+    Label score(s) by threshold band with one np.digitize lookup
+
+    Args:
+        score: Scalar or array of scores
+        bins: Ascending band thresholds
+        labels: len(bins) + 1 labels, lowest band first
+
+    Returns:
+        Label string for a scalar, array of labels for an array
+    """
+    score = np.asarray(score, dtype=float)
+    # NaN fails every threshold, so it falls in the lowest band
+    idx = np.where(np.isnan(score), 0, np.digitize(score, bins))
+    return labels[idx]
 
 
-def _interpret_hhi_based(score: float) -> str:
+def _interpret_pdi(pdi):
+    """Interpret PDI score(s)"""
+    return _interpret(pdi, PDI_BINS, PDI_LABELS)
+
+
+def _interpret_hhi_based(score):
     """Interpret HHI-based scores (JDI, IHI)"""
-    if score >= 75:
-        return "Low concentration"
-    elif score >= 50:
-        return "Moderate concentration"
-    elif score >= 25:
-        return "High concentration"
-    else:
-        return "Very high concentration"
+    return _interpret(score, HHI_BASED_BINS, HHI_BASED_LABELS)
 
 
-def _interpret_gdi(gdi: float) -> str:
-    """Interpret overall GDI score"""
-    if gdi >= 80:
-        return "Highly decentralized"
-    elif gdi >= 60:
-        return "Moderately decentralized"
-    elif gdi >= 40:
-        return "Weakly decentralized"
-    else:
-        return "Centralized"
+def _interpret_gdi(gdi):
+    """Interpret overall GDI score(s)"""
+    return _interpret(gdi, GDI_BINS, GDI_LABELS)
 
 
 if __name__ == '__main__':
     import sys
 
+    from json_utils import write_json
+
     # Test with Ethereum and Polygon
     networks = {
         'ethereum': '../../data/raw/2025-11-22-ethereum-ips.csv',
@@ -293,7 +497,5 @@ if __name__ == '__main__':
 
     # Save results
     if results:
-        import json
-        with open('../../data/gdi_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        write_json('../../data/gdi_results.json', results)
         print(f"\n✅ Results saved to data/gdi_results.json\n")
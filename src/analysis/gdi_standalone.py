@@ -3,15 +3,31 @@ GDI v0 Final - Standalone implementation
 All metrics 0-100, higher = more decentralized
 """
 
+import os
 import numpy as np
 import pandas as pd
-import geopandas as gpd
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict
-from shapely.geometry import Point
+from pyproj import Transformer
 from scipy.spatial import cKDTree
 from scipy import stats
+from scipy.special import xlogy
 import h3
 
+try:
+    from .json_utils import write_json
+    from .spatial_weights import cross_products, distance_band_weights, kdtree
+except ImportError:
+    from json_utils import write_json
+    from spatial_weights import cross_products, distance_band_weights, kdtree
+
+# Input columns read by calculate_gdi
+GDI_COLUMNS = ["lat", "lon", "country", "org"]
+
+# WGS84 lon/lat -> World Mollweide (equal-area) for distance calculations
+_TO_MOLLWEIDE = Transformer.from_crs("EPSG:4326", "ESRI:54009", always_xy=True)
+
 
 def calculate_pdi(
     df: pd.DataFrame, threshold_km: float = 500.0, h3_resolution: int = 5
@@ -23,21 +39,15 @@ def calculate_pdi(
 
     Higher = more dispersed, less clustered
     """
-    # Create GeoDataFrame
-    geometry = [Point(xy) for xy in zip(df["lon"], df["lat"])]
-    gdf = gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
-
-    # Reproject to equal-area for distance calculations (World Mollweide)
-    gdf_proj = gdf.to_crs("ESRI:54009")
+    # Project to equal-area for distance calculations (World Mollweide)
+    x, y = _TO_MOLLWEIDE.transform(df["lon"].to_numpy(), df["lat"].to_numpy())
+    coords = np.column_stack([x, y])
 
     # 1. Calculate Moran's I
-    morans_i, morans_p = _calculate_morans_i(gdf_proj, threshold_km)
-
-    # 2. Calculate Spatial HHI
-    spatial_hhi, num_cells = _calculate_spatial_hhi(df, h3_resolution)
+    morans_i, morans_p = _calculate_morans_i(coords, threshold_km)
 
-    # 3. Calculate ENL
-    enl = _calculate_enl(df, h3_resolution, num_cells)
+    # 2-3. Calculate Spatial HHI and ENL from one set of H3 cell counts
+    spatial_hhi, num_cells, enl = _calculate_h3_stats(df, h3_resolution)
 
     # Normalize and composite
     morans_norm = max(0, min(1, (1 - morans_i)))  # Invert: high clustering = low score
@@ -64,34 +74,22 @@ def calculate_pdi(
     }
 
 
-def _calculate_morans_i(gdf_proj, threshold_km: float) -> tuple:
-    """Calculate Moran's I using simple distance-based approach"""
-    coords = np.column_stack([gdf_proj.geometry.x, gdf_proj.geometry.y])
+def _calculate_morans_i(coords: np.ndarray, threshold_km: float) -> tuple:
+    """Calculate Moran's I on projected (x, y) coordinates using a distance band"""
     n = len(coords)
 
-    # Build spatial weights matrix (distance band)
-    threshold_m = threshold_km * 1000
-    tree = cKDTree(coords)
-    pairs = tree.query_pairs(threshold_m)
+    # Row-standardized distance-band weights (this simplified version has
+    # always counted coincident nodes as neighbors)
+    W = distance_band_weights(coords, threshold_km * 1000, include_coincident=True)
 
-    # Build weights matrix
-    W = np.zeros((n, n))
-    for i, j in pairs:
-        W[i, j] = 1
-        W[j, i] = 1
-
-    # Row-standardize
-    row_sums = W.sum(axis=1)
-    row_sums[row_sums == 0] = 1  # Avoid division by zero
-    W = W / row_sums[:, np.newaxis]
-
-    # Calculate local densities as attribute
-    local_density = _get_local_density(gdf_proj)
+    # Calculate local densities as attribute (on the KD-tree the weights
+    # were built from)
+    local_density = _get_local_density(kdtree(coords), coords)
     x = local_density - local_density.mean()
 
     # Moran's I = (N/W) * Σ Σ w_ij * (x_i - x̄)(x_j - x̄) / Σ(x_i - x̄)²
-    numerator = np.sum(W * np.outer(x, x))
-    denominator = np.sum(x**2)
+    numerator = cross_products(W, x[np.newaxis, :])[0]
+    denominator = x @ x
 
     I = (n / W.sum()) * (numerator / denominator) if denominator > 0 else 0
 
@@ -104,60 +102,85 @@ def _calculate_morans_i(gdf_proj, threshold_km: float) -> tuple:
     return I, p_value
 
 
-def _get_local_density(gdf_proj) -> np.ndarray:
+def _get_local_density(tree: cKDTree, coords: np.ndarray) -> np.ndarray:
     """Calculate local density using nearest neighbor"""
-    coords = np.column_stack([gdf_proj.geometry.x, gdf_proj.geometry.y])
-    tree = cKDTree(coords)
-
-    # Distance to 5th nearest neighbor
-    distances, _ = tree.query(coords, k=6)  # k=6 to skip self
-    k_distance = distances[:, 5]  # 5th neighbor
+    # Distance to 5th nearest neighbor (k=[6] returns only that column, skipping self)
+    distances, _ = tree.query(coords, k=[6], workers=-1)
+    k_distance = distances[:, 0]
 
     # Density = 1 / distance (closer neighbors = higher density)
     density = 1.0 / (k_distance + 1)  # +1 to avoid division by zero
     return density
 
 
-def _calculate_spatial_hhi(df: pd.DataFrame, resolution: int) -> tuple:
-    """Calculate Spatial HHI across H3 grid"""
-    # Convert to H3 cells
-    cells = df.apply(
-        lambda row: h3.latlng_to_cell(row["lat"], row["lon"], resolution), axis=1
+@lru_cache(maxsize=8)
+def _h3_cells(lat_bytes: bytes, lon_bytes: bytes, resolution: int) -> np.ndarray:
+    """H3 cell for every (lat, lon) pair, cached per coordinate set and resolution"""
+    lats = np.frombuffer(lat_bytes, dtype=np.float64)
+    lons = np.frombuffer(lon_bytes, dtype=np.float64)
+    cells = np.fromiter(
+        (h3.latlng_to_cell(lat, lon, resolution) for lat, lon in zip(lats, lons)),
+        dtype=object,
+        count=len(lats),
     )
+    cells.flags.writeable = False  # Shared between callers via the cache
+    return cells
+
+
+def _calculate_h3_stats(df: pd.DataFrame, resolution: int) -> tuple:
+    """Calculate Spatial HHI and Effective Number of Locations across H3 grid
+
+    Both metrics share one H3 assignment and one count pass.
+
+    Returns:
+        (spatial_hhi, num_cells, enl)
+    """
+    # Convert to H3 cells (memoized on the coordinate bytes for repeated runs)
+    lats = df["lat"].to_numpy(dtype=np.float64)
+    lons = df["lon"].to_numpy(dtype=np.float64)
+    cells = _h3_cells(lats.tobytes(), lons.tobytes(), resolution)
 
     # Count nodes per cell
-    cell_counts = cells.value_counts()
+    _, cell_counts = np.unique(cells, return_counts=True)
     total_nodes = len(df)
     num_cells = len(cell_counts)
 
-    # Calculate shares and HHI
+    # Cell shares double as probabilities for the entropy
     shares = cell_counts / total_nodes
-    hhi = (shares**2).sum()
 
-    return hhi, num_cells
+    # Spatial HHI
+    hhi = shares @ shares
 
+    # Effective number = exp(Shannon entropy)
+    entropy = -np.sum(xlogy(shares, shares))
+    enl = np.exp(entropy)
 
-def _calculate_enl(df: pd.DataFrame, resolution: int, num_cells: int) -> float:
-    """Calculate Effective Number of Locations via entropy"""
-    # Convert to H3 cells
-    cells = df.apply(
-        lambda row: h3.latlng_to_cell(row["lat"], row["lon"], resolution), axis=1
-    )
+    return hhi, num_cells, enl
 
-    # Count nodes per cell
-    cell_counts = cells.value_counts()
-    total_nodes = len(df)
 
-    # Calculate probabilities
-    probabilities = cell_counts / total_nodes
+def _category_counts(values: pd.Series) -> tuple:
+    """Count category occurrences in first-appearance order
 
-    # Shannon entropy
-    entropy = -np.sum(probabilities * np.log(probabilities))
+    Returns:
+        (labels, counts) with counts as an int array
+    """
+    codes, uniques = pd.factorize(values)
+    codes = codes[codes >= 0]  # Missing values (code -1) are not counted
+    return uniques.to_numpy(), np.bincount(codes, minlength=len(uniques))
 
-    # Effective number = exp(entropy)
-    enl = np.exp(entropy)
 
-    return enl
+def _top_indices(counts: np.ndarray, k: int = 3) -> np.ndarray:
+    """Indices of the k largest counts, ties kept in first-appearance order
+
+    Matches the order of value_counts().head(k) without sorting every category.
+    """
+    if len(counts) > k:
+        threshold = np.partition(counts, -k)[-k]
+        candidates = np.flatnonzero(counts >= threshold)
+    else:
+        candidates = np.arange(len(counts))
+    order = np.argsort(-counts[candidates], kind="stable")
+    return candidates[order[:k]]
 
 
 def calculate_jdi(df: pd.DataFrame) -> Dict:
@@ -168,12 +191,13 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
 
     Rewards both even distribution AND absolute diversity
     """
-    country_counts = df["country"].value_counts()
+    countries, country_counts = _category_counts(df["country"])
     total_nodes = len(df)
     num_countries = len(country_counts)
 
+    # Shares computed once for HHI, top-share penalty and top-3
     shares = country_counts / total_nodes
-    country_hhi = (shares**2).sum()
+    country_hhi = shares @ shares
 
     # HHI component (30%)
     hhi_component = 0.3 * (1 - country_hhi)
@@ -185,9 +209,8 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
 
     # Top concentration penalty (35%)
     # Penalize if top country has > 15% of nodes
-    top_country_share = (
-        country_counts.iloc[0] / total_nodes if len(country_counts) > 0 else 0
-    )
+    top_idx = _top_indices(country_counts)
+    top_country_share = shares[top_idx[0]] if len(top_idx) > 0 else 0
     concentration_penalty = 0.35 * max(
         0, (top_country_share - 0.15) / 0.35
     )  # Linear from 15% to 50%
@@ -195,8 +218,12 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
     jdi = 100 * (hhi_component + diversity_bonus - concentration_penalty)
 
     top_3 = {
-        k: {"count": v, "share": round(v / total_nodes * 100, 1)}
-        for k, v in country_counts.head(3).items()
+        k: {"count": v, "share": round(share * 100, 1)}
+        for k, v, share in zip(
+            countries[top_idx].tolist(),
+            country_counts[top_idx].tolist(),
+            shares[top_idx].tolist(),
+        )
     }
 
     return {
@@ -220,12 +247,13 @@ def calculate_ihi(df: pd.DataFrame) -> Dict:
 
     Rewards both even distribution AND absolute diversity
     """
-    org_counts = df["org"].value_counts()
+    orgs, org_counts = _category_counts(df["org"])
     total_nodes = len(df)
     num_orgs = len(org_counts)
 
+    # Shares computed once for HHI, top-share penalty and top-3
     shares = org_counts / total_nodes
-    org_hhi = (shares**2).sum()
+    org_hhi = shares @ shares
 
     # HHI component (30%)
     hhi_component = 0.3 * (1 - org_hhi)
@@ -237,7 +265,8 @@ def calculate_ihi(df: pd.DataFrame) -> Dict:
 
     # Top concentration penalty (35%)
     # Penalize if top org has > 3% of nodes
-    top_org_share = org_counts.iloc[0] / total_nodes if len(org_counts) > 0 else 0
+    top_idx = _top_indices(org_counts)
+    top_org_share = shares[top_idx[0]] if len(top_idx) > 0 else 0
     concentration_penalty = 0.35 * max(
         0, (top_org_share - 0.03) / 0.17
     )  # Linear from 3% to 20%
@@ -245,8 +274,12 @@ def calculate_ihi(df: pd.DataFrame) -> Dict:
     ihi = 100 * (hhi_component + diversity_bonus - concentration_penalty)
 
     top_3 = {
-        k: {"count": v, "share": round(v / total_nodes * 100, 1)}
-        for k, v in org_counts.head(3).items()
+        k: {"count": v, "share": round(share * 100, 1)}
+        for k, v, share in zip(
+            orgs[top_idx].tolist(),
+            org_counts[top_idx].tolist(),
+            shares[top_idx].tolist(),
+        )
     }
 
     return {
@@ -414,6 +447,17 @@ def transform_to_network_format(results: Dict) -> list:
     return networks_array
 
 
+def _load_and_score(filepath: str) -> Dict:
+    """Read one network's CSV and compute its GDI (runs in a worker process)"""
+    # Only the columns calculate_gdi uses; Arrow's parser is multithreaded
+    try:
+        df = pd.read_csv(filepath, usecols=GDI_COLUMNS, engine="pyarrow")
+    except ImportError:
+        df = pd.read_csv(filepath, usecols=GDI_COLUMNS)
+
+    return calculate_gdi(df)
+
+
 if __name__ == "__main__":
     networks = {
         "ethereum": "../../data/raw/2025-11-22-ethereum-ips.csv",
@@ -423,12 +467,19 @@ if __name__ == "__main__":
 
     results = {}
 
-    for network_name, filepath in networks.items():
+    # Networks are independent, so score them in parallel worker processes
+    max_workers = min(len(networks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            network_name: executor.submit(_load_and_score, filepath)
+            for network_name, filepath in networks.items()
+        }
+
+    # Report in submission order so output stays deterministic
+    for network_name in networks:
         try:
             print(f"\nProcessing {network_name.title()}...")
-            df = pd.read_csv(filepath)
-
-            result = calculate_gdi(df)
+            result = futures[network_name].result()
             results[network_name] = result
 
             print(f"\n{'=' * 60}")
@@ -480,21 +531,17 @@ if __name__ == "__main__":
 
     # Transform to Network[] format and save
     if results:
-        import json
         import shutil
 
         networks_array = transform_to_network_format(results)
 
         # Save to data directory
         data_path = "../../data/gdi_results.json"
-        with open(data_path, "w") as f:
-            json.dump(networks_array, f, indent=2)
+        write_json(data_path, networks_array)
         print(f"\n✅ Saved to {data_path} (Network[] format)")
 
         # Also copy to frontend location for direct import
         frontend_path = "../../src/frontend/geobeat-ui/lib/data/gdi_results.json"
-        import os
-
         os.makedirs(os.path.dirname(frontend_path), exist_ok=True)
         shutil.copy(data_path, frontend_path)
         print(f"✅ Copied to {frontend_path}\n")
@@ -13,11 +13,14 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import json
 
+from json_utils import write_json
 
-def add_noise(values, noise_level=0.05):
-    """Add realistic noise to time series"""
-    noise = np.random.normal(0, noise_level, len(values))
-    return values + noise * values
+
+def add_noise(values, noise_level=0.05, rng=None):
+    """Add realistic noise to time series (rng: numpy Generator, fresh if None)"""
+    if rng is None:
+        rng = np.random.default_rng()
+    return values * (1 + noise_level * rng.standard_normal(len(values)))
 
 
 def generate_trend(start_value, end_value, num_points, trend_type='linear'):
@@ -47,99 +50,120 @@ def generate_trend(start_value, end_value, num_points, trend_type='linear'):
         raise ValueError(f"Unknown trend type: {trend_type}")
 
 
-def generate_morans_i_series(current_value=0.4043, days=30):
-    """
-    Generate Moran's I time series
+# Per-metric series settings: (start value, trend type, noise level, clip range).
+# Start values sit 30 days back: more clustered/concentrated than today.
+SERIES_SPECS = {
+    'morans_i': (0.55, 'sigmoid', 0.08, (-1, 1)),
+    'spatial_hhi': (0.035, 'linear', 0.10, (0, 1)),
+    'enl': (180, 'exponential', 0.06, (1, np.inf)),
+    'ann': (0.05, 'sigmoid', 0.12, (0, 2.15)),
+}
 
-    Trend: Decreasing (from higher clustering toward more random)
-    Current: 0.4043 (moderate clustering)
-    Target: Move from ~0.55 to current value
-    """
-    # Start with higher clustering, trend toward current
-    start_value = 0.55
-    base_trend = generate_trend(start_value, current_value, days, trend_type='sigmoid')
 
-    # Add realistic noise (Moran's I typically has moderate variability)
-    noisy = add_noise(base_trend, noise_level=0.08)
+def _generate_series(name, current_value, days, rng=None):
+    """Trend from the SERIES_SPECS start value to current_value, plus noise"""
+    start_value, trend_type, noise_level, (lower, upper) = SERIES_SPECS[name]
+    base_trend = generate_trend(start_value, current_value, days, trend_type=trend_type)
+    noisy = add_noise(base_trend, noise_level=noise_level, rng=rng)
 
     # Ensure final value is exactly the current measurement
     noisy[-1] = current_value
 
-    # Clip to valid range [-1, 1], though in practice usually [0, 1]
-    return np.clip(noisy, -1, 1)
+    return np.clip(noisy, lower, upper)
 
 
-def generate_spatial_hhi_series(current_value=0.0184, days=30):
+def generate_morans_i_series(current_value=0.4043, days=30, rng=None):
     """
-    Generate Spatial HHI time series
+    Generate Moran's I time series
 
-    Trend: Decreasing (from higher concentration toward lower)
-    Current: 0.0184 (very low concentration)
-    Target: Move from ~0.035 to current value
+    Trend: Decreasing (from higher clustering toward more random)
+    Current: 0.4043 (moderate clustering)
+    Target: Move from ~0.55 to current value (sigmoid, 8% noise, clipped to [-1, 1])
     """
-    # Start with higher concentration
-    start_value = 0.035
-    base_trend = generate_trend(start_value, current_value, days, trend_type='linear')
+    return _generate_series('morans_i', current_value, days, rng)
 
-    # Add realistic noise (HHI can jump if nodes relocate)
-    noisy = add_noise(base_trend, noise_level=0.10)
 
-    # Ensure final value matches current
-    noisy[-1] = current_value
+def generate_spatial_hhi_series(current_value=0.0184, days=30, rng=None):
+    """
+    Generate Spatial HHI time series
 
-    # HHI range [0, 1]
-    return np.clip(noisy, 0, 1)
+    Trend: Decreasing (from higher concentration toward lower)
+    Current: 0.0184 (very low concentration)
+    Target: Move from ~0.035 to current value (linear, 10% noise, clipped to [0, 1])
+    """
+    return _generate_series('spatial_hhi', current_value, days, rng)
 
 
-def generate_enl_series(current_value=237.5, days=30):
+def generate_enl_series(current_value=237.5, days=30, rng=None):
     """
     Generate Effective Number of Locations time series
 
     Trend: Increasing (nodes spreading to more locations)
     Current: 237.5 effective locations
-    Target: Move from ~180 to current value
+    Target: Move from ~180 to current value (exponential, 6% noise, at least 1)
     """
-    # Start with fewer effective locations
-    start_value = 180
-    base_trend = generate_trend(start_value, current_value, days, trend_type='exponential')
-
-    # Add noise (ENL relatively stable, but can change as nodes move)
-    noisy = add_noise(base_trend, noise_level=0.06)
-
-    # Ensure final value matches
-    noisy[-1] = current_value
+    return _generate_series('enl', current_value, days, rng)
 
-    # ENL must be positive
-    return np.clip(noisy, 1, None)
 
-
-def generate_ann_series(current_value=0.073, days=30):
+def generate_ann_series(current_value=0.073, days=30, rng=None):
     """
     Generate Average Nearest Neighbor time series
 
     Trend: Increasing (less clustering, more dispersion)
     Current: 0.073 (strong clustering)
-    Target: Move from ~0.05 to current value
+    Target: Move from ~0.05 to current value (sigmoid, 12% noise, clipped to [0, 2.15])
     """
-    # Start with even stronger clustering
-    start_value = 0.05
-    base_trend = generate_trend(start_value, current_value, days, trend_type='sigmoid')
+    return _generate_series('ann', current_value, days, rng)
 
-    # Add noise (ANN can be quite variable)
-    noisy = add_noise(base_trend, noise_level=0.12)
 
-    # Ensure final value matches
-    noisy[-1] = current_value
+def _build_all_series(current_metrics, days, rng):
+    """
+    Generate every metric series in one vectorized pass
+
+    Each trend curve is evaluated once on a shared [0, 1] axis, all noise is
+    drawn with a single standard_normal call, and final values are anchored
+    with one assignment.
+
+    Args:
+        current_metrics: Dict with current value per metric in SERIES_SPECS
+        days: Number of data points
+        rng: numpy.random.Generator used for the noise
+
+    Returns:
+        Dict mapping metric name to its series array
+    """
+    names = list(SERIES_SPECS)
+    start, trend, noise_level, clip = zip(*(SERIES_SPECS[name] for name in names))
+    start = np.array(start, dtype=float)[:, np.newaxis]
+    end = np.array([current_metrics[name] for name in names], dtype=float)
+    noise_level = np.array(noise_level)[:, np.newaxis]
+    lower, upper = (np.array(bound, dtype=float)[:, np.newaxis] for bound in zip(*clip))
+
+    # Trend curves scaled to [0, 1], same shapes as generate_trend
+    t = np.linspace(0, 1, days)
+    curves = {
+        'linear': t,
+        'sigmoid': 1 / (1 + np.exp(-(12 * t - 6))),
+        'exponential': 1 - np.exp(-3 * t),
+    }
+    series = start + (end[:, np.newaxis] - start) * np.stack([curves[kind] for kind in trend])
+
+    # Multiplicative noise for all metrics at once
+    series += noise_level * series * rng.standard_normal(series.shape)
+
+    # Ensure final values are exactly the current measurements
+    series[:, -1] = end
 
-    # ANN typically [0, 2.15] for point patterns
-    return np.clip(noisy, 0, 2.15)
+    np.clip(series, lower, upper, out=series)
+    return dict(zip(names, series))
 
 
 def generate_timeseries_data(
     network='ethereum',
     current_metrics=None,
     days=30,
-    output_format='json'
+    output_format='json',
+    seed=None
 ):
     """
     Generate complete time-series dataset
@@ -149,6 +173,7 @@ def generate_timeseries_data(
         current_metrics: Dict with current metric values (from latest analysis)
         days: Number of days of historical data
         output_format: 'json' or 'csv'
+        seed: Random seed for reproducible noise
 
     Returns:
         DataFrame with time-series data
@@ -166,34 +191,43 @@ def generate_timeseries_data(
     end_date = datetime.utcnow()
     dates = [end_date - timedelta(days=i) for i in range(days-1, -1, -1)]
 
-    # Generate each metric's time series
-    morans_i = generate_morans_i_series(current_metrics['morans_i'], days)
-    spatial_hhi = generate_spatial_hhi_series(current_metrics['spatial_hhi'], days)
-    enl = generate_enl_series(current_metrics['enl'], days)
-    ann = generate_ann_series(current_metrics['ann'], days)
+    # Generate all metric time series together
+    series = _build_all_series(current_metrics, days, np.random.default_rng(seed))
+    morans_i = series['morans_i']
+    spatial_hhi = series['spatial_hhi']
+    enl = series['enl']
+    ann = series['ann']
 
     # Create DataFrame
     df = pd.DataFrame({
         'date': dates,
         'network': network,
         'morans_i': morans_i,
-        'morans_i_interpretation': ['Significant clustering' if m > 0.3 else
-                                    'Moderate clustering' if m > 0.1 else
-                                    'Random pattern' for m in morans_i],
+        'morans_i_interpretation': np.select(
+            [morans_i > 0.3, morans_i > 0.1],
+            ['Significant clustering', 'Moderate clustering'],
+            default='Random pattern'
+        ),
         'spatial_hhi': spatial_hhi,
-        'spatial_hhi_interpretation': ['High concentration' if h > 0.25 else
-                                        'Moderate concentration' if h > 0.15 else
-                                        'Low concentration' for h in spatial_hhi],
+        'spatial_hhi_interpretation': np.select(
+            [spatial_hhi > 0.25, spatial_hhi > 0.15],
+            ['High concentration', 'Moderate concentration'],
+            default='Low concentration'
+        ),
         'enl': enl,
         'ann': ann,
-        'ann_interpretation': ['Significant clustering' if a < 0.8 else
-                              'Random pattern' if a < 1.2 else
-                              'Dispersion' for a in ann]
+        'ann_interpretation': np.select(
+            [ann < 0.8, ann < 1.2],
+            ['Significant clustering', 'Random pattern'],
+            default='Dispersion'
+        )
     })
 
-    # Add computed fields
-    df['timestamp'] = df['date'].apply(lambda x: x.isoformat())
-    df['date_str'] = df['date'].apply(lambda x: x.strftime('%Y-%m-%d'))
+    # Add computed fields. All dates share end_date's time of day, so one
+    # format reproduces isoformat() for every row.
+    iso_format = '%Y-%m-%dT%H:%M:%S.%f' if end_date.microsecond else '%Y-%m-%dT%H:%M:%S'
+    df['timestamp'] = df['date'].dt.strftime(iso_format)
+    df['date_str'] = df['date'].dt.strftime('%Y-%m-%d')
 
     return df
 
@@ -214,7 +248,7 @@ def save_timeseries(df, output_dir, network='ethereum', format='both'):
     if format in ['json', 'both']:
         # JSON format for web UI
         # Drop datetime objects, keep string representations
-        df_json = df.drop(columns=['date']).copy()
+        df_json = df.drop(columns=['date'])
 
         json_data = {
             'network': network,
@@ -225,8 +259,7 @@ def save_timeseries(df, output_dir, network='ethereum', format='both'):
         }
 
         json_path = output_dir / f'{network}_timeseries.json'
-        with open(json_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        write_json(json_path, json_data)
         print(f"Saved JSON: {json_path}")
 
     if format in ['csv', 'both']:
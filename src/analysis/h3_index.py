@@ -0,0 +1,44 @@
+"""
+Point-to-H3-cell indexing shared by the PDI implementations
+"""
+
+import numpy as np
+import h3.api.numpy_int as h3_int
+
+# Optional: vectorized point-to-cell indexing (falls back to per-point h3 calls)
+try:
+    from h3ronpy.vector import coordinates_to_cells
+except ImportError:
+    try:
+        from h3ronpy.arrow.vector import coordinates_to_cells
+    except ImportError:
+        coordinates_to_cells = None
+
+
+def points_to_h3_uint64(lat, lon, resolution: int) -> np.ndarray:
+    """
+    H3 cell for every point as uint64 IDs
+
+    Integer IDs hash and count much faster than the 15-character cell
+    strings; convert with h3.int_to_str where strings are reported.
+    Uses h3ronpy's vectorized (Rust) indexing when installed, otherwise
+    h3-py per point.
+
+    Args:
+        lat: Latitudes in degrees
+        lon: Longitudes in degrees
+        resolution: H3 resolution
+
+    Returns:
+        uint64 array of cell IDs, one per point
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if coordinates_to_cells is not None:
+        return np.asarray(coordinates_to_cells(lat, lon, resolution), dtype=np.uint64)
+
+    return np.fromiter(
+        (h3_int.latlng_to_cell(a, b, resolution) for a, b in zip(lat.tolist(), lon.tolist())),
+        dtype=np.uint64,
+        count=len(lat)
+    )
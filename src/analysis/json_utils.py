@@ -0,0 +1,33 @@
+"""
+JSON output shared by the analysis scripts
+
+Serializes with orjson when it is installed (faster, and handles NumPy
+scalars and arrays natively); falls back to the standard json module.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json(path, obj, indent: bool = True) -> None:
+    """
+    Write obj to path as JSON
+
+    Args:
+        path: Output file path
+        obj: Data to serialize
+        indent: Indent with two spaces; False writes compact JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2 if indent else None)
@@ -99,9 +99,8 @@ class NetworkSnapshot(BaseModel):
     def __init__(self, **data):
         super().__init__(**data)
         self.total_nodes = len(self.nodes)
-        self.nodes_with_location = sum(
-            1 for n in self.nodes
-            if n.latitude is not None and n.longitude is not None
-        )
+        # NodeLocation requires finite latitude/longitude, so every node
+        # in the snapshot is located
+        self.nodes_with_location = self.total_nodes
         if self.total_nodes > 0:
             self.location_coverage = self.nodes_with_location / self.total_nodes
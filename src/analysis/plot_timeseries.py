@@ -12,6 +12,50 @@ from pathlib import Path
 
 sns.set_theme(style="whitegrid")
 
+# Per-panel styling, in axes.flat order (top-left, top-right, bottom-left,
+# bottom-right). 'refs' are (y, color, label) reference lines and 'trend' is
+# the (decrease, increase) annotation text. 'rising' picks the increase text
+# from the % change; a zero (or NaN) change reads as an increase for Moran's I
+# and HHI but as a decrease for ENL and ANN.
+PANELS = [
+    {
+        'col': 'morans_i',
+        'color': 'steelblue',
+        'refs': [(0, 'red', 'Random (I=0)')],
+        'ylabel': "Moran's I",
+        'title': "Spatial Autocorrelation (Clustering)",
+        'trend': ('↓ Less clustered', '↑ More clustered'),
+        'rising': lambda change: not change < 0,
+    },
+    {
+        'col': 'spatial_hhi',
+        'color': 'coral',
+        'refs': [(0.15, 'orange', 'Moderate threshold'), (0.25, 'red', 'High threshold')],
+        'ylabel': "Spatial HHI",
+        'title': "Geographic Concentration",
+        'trend': ('↓ Less concentrated', '↑ More concentrated'),
+        'rising': lambda change: not change < 0,
+    },
+    {
+        'col': 'enl',
+        'color': 'green',
+        'refs': [],
+        'ylabel': "Effective Number of Locations",
+        'title': "Location Diversity",
+        'trend': ('↓ Less diverse', '↑ More diverse'),
+        'rising': lambda change: change > 0,
+    },
+    {
+        'col': 'ann',
+        'color': 'purple',
+        'refs': [(1.0, 'red', 'Random (ANN=1)')],
+        'ylabel': "ANN Index",
+        'title': "Point Pattern Analysis",
+        'trend': ('↓ More clustered', '↑ More dispersed'),
+        'rising': lambda change: change > 0,
+    },
+]
+
 
 def plot_timeseries_dashboard(json_path, save_path=None):
     """
@@ -37,100 +81,31 @@ def plot_timeseries_dashboard(json_path, save_path=None):
         y=0.995
     )
 
-    # 1. Moran's I (top-left)
-    ax1 = axes[0, 0]
-    ax1.plot(df['date'], df['morans_i'], linewidth=2, color='steelblue', marker='o', markersize=4)
-    ax1.axhline(y=0, color='red', linestyle='--', alpha=0.5, label='Random (I=0)')
-    ax1.fill_between(df['date'], df['morans_i'], 0, alpha=0.2, color='steelblue')
-    ax1.set_ylabel("Moran's I", fontsize=12, fontweight='bold')
-    ax1.set_title("Spatial Autocorrelation (Clustering)", fontsize=13)
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    ax1.tick_params(axis='x', rotation=45)
-
-    # Add trend annotation
-    start_val = df['morans_i'].iloc[0]
-    end_val = df['morans_i'].iloc[-1]
-    change = ((end_val - start_val) / start_val) * 100
-    ax1.text(
-        0.05, 0.95,
-        f"Change: {change:+.1f}%\n{'↓ Less clustered' if change < 0 else '↑ More clustered'}",
-        transform=ax1.transAxes,
-        fontsize=10,
-        verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-    )
-
-    # 2. Spatial HHI (top-right)
-    ax2 = axes[0, 1]
-    ax2.plot(df['date'], df['spatial_hhi'], linewidth=2, color='coral', marker='o', markersize=4)
-    ax2.axhline(y=0.15, color='orange', linestyle='--', alpha=0.5, label='Moderate threshold')
-    ax2.axhline(y=0.25, color='red', linestyle='--', alpha=0.5, label='High threshold')
-    ax2.fill_between(df['date'], df['spatial_hhi'], 0, alpha=0.2, color='coral')
-    ax2.set_ylabel("Spatial HHI", fontsize=12, fontweight='bold')
-    ax2.set_title("Geographic Concentration", fontsize=13)
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    ax2.tick_params(axis='x', rotation=45)
-
-    # Add trend annotation
-    start_val = df['spatial_hhi'].iloc[0]
-    end_val = df['spatial_hhi'].iloc[-1]
-    change = ((end_val - start_val) / start_val) * 100
-    ax2.text(
-        0.05, 0.95,
-        f"Change: {change:+.1f}%\n{'↓ Less concentrated' if change < 0 else '↑ More concentrated'}",
-        transform=ax2.transAxes,
-        fontsize=10,
-        verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-    )
-
-    # 3. ENL (bottom-left)
-    ax3 = axes[1, 0]
-    ax3.plot(df['date'], df['enl'], linewidth=2, color='green', marker='o', markersize=4)
-    ax3.fill_between(df['date'], df['enl'], 0, alpha=0.2, color='green')
-    ax3.set_ylabel("Effective Number of Locations", fontsize=12, fontweight='bold')
-    ax3.set_title("Location Diversity", fontsize=13)
-    ax3.grid(True, alpha=0.3)
-    ax3.tick_params(axis='x', rotation=45)
-
-    # Add trend annotation
-    start_val = df['enl'].iloc[0]
-    end_val = df['enl'].iloc[-1]
-    change = ((end_val - start_val) / start_val) * 100
-    ax3.text(
-        0.05, 0.95,
-        f"Change: {change:+.1f}%\n{'↑ More diverse' if change > 0 else '↓ Less diverse'}",
-        transform=ax3.transAxes,
-        fontsize=10,
-        verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-    )
-
-    # 4. ANN (bottom-right)
-    ax4 = axes[1, 1]
-    ax4.plot(df['date'], df['ann'], linewidth=2, color='purple', marker='o', markersize=4)
-    ax4.axhline(y=1.0, color='red', linestyle='--', alpha=0.5, label='Random (ANN=1)')
-    ax4.fill_between(df['date'], df['ann'], 0, alpha=0.2, color='purple')
-    ax4.set_ylabel("ANN Index", fontsize=12, fontweight='bold')
-    ax4.set_title("Point Pattern Analysis", fontsize=13)
-    ax4.legend()
-    ax4.grid(True, alpha=0.3)
-    ax4.tick_params(axis='x', rotation=45)
-
-    # Add trend annotation
-    start_val = df['ann'].iloc[0]
-    end_val = df['ann'].iloc[-1]
-    change = ((end_val - start_val) / start_val) * 100
-    ax4.text(
-        0.05, 0.95,
-        f"Change: {change:+.1f}%\n{'↑ More dispersed' if change > 0 else '↓ More clustered'}",
-        transform=ax4.transAxes,
-        fontsize=10,
-        verticalalignment='top',
-        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-    )
+    cols = [cfg['col'] for cfg in PANELS]
+    values = df[cols].to_numpy()
+    changes = (values[-1] / values[0] - 1) * 100
+
+    for ax, cfg, change in zip(axes.flat, PANELS, changes):
+        ax.plot(df['date'], df[cfg['col']], linewidth=2, color=cfg['color'], marker='o', markersize=4)
+        for y, color, label in cfg['refs']:
+            ax.axhline(y=y, color=color, linestyle='--', alpha=0.5, label=label)
+        ax.fill_between(df['date'], df[cfg['col']], 0, alpha=0.2, color=cfg['color'])
+        ax.set_ylabel(cfg['ylabel'], fontsize=12, fontweight='bold')
+        ax.set_title(cfg['title'], fontsize=13)
+        if cfg['refs']:
+            ax.legend()
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis='x', rotation=45)
+
+        # Add trend annotation
+        ax.text(
+            0.05, 0.95,
+            f"Change: {change:+.1f}%\n{cfg['trend'][int(cfg['rising'](change))]}",
+            transform=ax.transAxes,
+            fontsize=10,
+            verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+        )
 
     plt.tight_layout()
 
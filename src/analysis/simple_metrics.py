@@ -3,10 +3,66 @@ Simple GDI v0 metrics for hackathon
 Calculates PDI, JDI, IHI using simplest defensible approaches
 """
 
+from collections import Counter
 import numpy as np
 import pandas as pd
+from scipy.special import xlogy
 from typing import Dict, Tuple
 
+try:
+    from .h3_index import points_to_h3_uint64
+except ImportError:
+    from h3_index import points_to_h3_uint64
+
+
+# Below this many rows collections.Counter counts categories faster than
+# Series.value_counts; above it pandas' hash table wins
+SMALL_INPUT_ROWS = 1_000
+
+
+def _count_categories(values: pd.Series) -> Counter:
+    """
+    Count non-missing categories, in order of first appearance
+
+    Args:
+        values: Categorical column (e.g. 'country', 'provider')
+
+    Returns:
+        Counter of category -> count
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Count the integer codes; keep observed categories in
+        # first-appearance order
+        codes = values.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(values.cat.categories))
+        present, first_seen = np.unique(codes, return_index=True)
+        categories = values.cat.categories
+        return Counter({
+            categories[code]: int(counts[code])
+            for code in present[np.argsort(first_seen)]
+        })
+
+    if len(values) < SMALL_INPUT_ROWS:
+        array = values.to_numpy()
+        return Counter(array[pd.notna(array)])
+    return Counter(values.value_counts(sort=False).to_dict())
+
+
+def concentration_stats(counts, total: int) -> Tuple[float, float]:
+    """
+    HHI and Shannon entropy of category shares
+
+    Args:
+        counts: Count per category (array or Series); zeros contribute nothing
+        total: Total the shares are taken against
+
+    Returns:
+        (hhi, entropy)
+    """
+    shares = np.asarray(counts) / total
+    return float(shares @ shares), float(-xlogy(shares, shares).sum())
+
 
 def calculate_pdi(df: pd.DataFrame, h3_resolution: int = 5) -> Dict:
     """
@@ -21,24 +77,17 @@ def calculate_pdi(df: pd.DataFrame, h3_resolution: int = 5) -> Dict:
     Returns:
         Dict with pdi score and metadata
     """
-    import h3
-
-    # Convert to H3 cells
-    df = df.copy()
-    df['h3_cell'] = df.apply(
-        lambda row: h3.latlng_to_cell(row['lat'], row['lon'], h3_resolution),
-        axis=1
-    )
+    # Convert to H3 cells (uint64 IDs count faster than cell strings);
+    # kept as a standalone array so the input frame is neither copied
+    # nor mutated
+    cells = points_to_h3_uint64(df['lat'].to_numpy(), df['lon'].to_numpy(), h3_resolution)
 
     # Count nodes per cell
-    cell_counts = df['h3_cell'].value_counts()
+    cell_counts = pd.Series(cells).value_counts(sort=False)
     total_nodes = len(df)
 
-    # Calculate shares
-    shares = cell_counts / total_nodes
-
     # Spatial HHI = sum of squared shares
-    spatial_hhi = (shares ** 2).sum()
+    spatial_hhi, _ = concentration_stats(cell_counts, total_nodes)
 
     # PDI = inverted (higher = more dispersed)
     pdi = 100 * (1 - spatial_hhi)
@@ -47,7 +96,7 @@ def calculate_pdi(df: pd.DataFrame, h3_resolution: int = 5) -> Dict:
         'pdi': round(pdi, 1),
         'spatial_hhi': round(spatial_hhi, 3),
         'num_cells': len(cell_counts),
-        'max_cell_share': round(shares.max() * 100, 1),
+        'max_cell_share': round(cell_counts.max() / total_nodes * 100, 1),
         'interpretation': _interpret_pdi(pdi)
     }
 
@@ -65,15 +114,13 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
         Dict with jdi score and metadata
     """
     # Country counts
-    country_counts = df['country'].value_counts()
+    country_counts = _count_categories(df['country'])
     total_nodes = len(df)
     num_countries = len(country_counts)
 
-    # Calculate probabilities
-    probabilities = country_counts / total_nodes
-
-    # Shannon entropy
-    entropy = -np.sum(probabilities * np.log(probabilities))
+    # Shannon entropy of country shares
+    counts = np.fromiter(country_counts.values(), dtype=np.int64, count=num_countries)
+    _, entropy = concentration_stats(counts, total_nodes)
 
     # Effective number of countries
     effective_countries = np.exp(entropy)
@@ -86,7 +133,7 @@ def calculate_jdi(df: pd.DataFrame) -> Dict:
         'num_countries': num_countries,
         'effective_countries': round(effective_countries, 1),
         'entropy': round(entropy, 3),
-        'top_3_countries': country_counts.head(3).to_dict(),
+        'top_3_countries': dict(country_counts.most_common(3)),
         'interpretation': _interpret_jdi(jdi)
     }
 
@@ -103,29 +150,30 @@ def calculate_ihi(df: pd.DataFrame) -> Dict:
     Returns:
         Dict with ihi score and metadata
     """
-    # Categorize providers
-    df = df.copy()
-    df['provider'] = df.apply(_categorize_provider, axis=1)
+    # Categorize providers (without copying or mutating the input frame)
+    providers = pd.Series(_categorize_providers(df))
 
     # Provider counts
-    provider_counts = df['provider'].value_counts()
+    provider_counts = _count_categories(providers)
     total_nodes = len(df)
 
-    # Calculate shares
-    shares = provider_counts / total_nodes
-
     # Provider HHI
-    provider_hhi = (shares ** 2).sum()
+    counts = np.fromiter(provider_counts.values(), dtype=np.int64, count=len(provider_counts))
+    provider_hhi, _ = concentration_stats(counts, total_nodes)
 
     # IHI = inverted (higher = more diverse)
     ihi = 100 * (1 - provider_hhi)
 
+    # Top-3 provider shares (%); most_common(k) selects with a heap rather
+    # than sorting every provider. Counts are plain ints, so shares round
+    # with Python's round() as before
+    top_3 = provider_counts.most_common(3)
+
     return {
         'ihi': round(ihi, 1),
         'provider_hhi': round(provider_hhi, 3),
         'num_providers': len(provider_counts),
-        'top_3_providers': {k: round(v/total_nodes*100, 1)
-                           for k, v in provider_counts.head(3).items()},
+        'top_3_providers': {k: round(v / total_nodes * 100, 1) for k, v in top_3},
         'interpretation': _interpret_ihi(ihi)
     }
 
@@ -163,32 +211,53 @@ def calculate_gdi(df: pd.DataFrame, weights: Tuple[float, float, float] = (0.4,
     }
 
 
-def _categorize_provider(row) -> str:
-    """Simple provider categorization from org/asname/isp"""
-    text = ' '.join([
-        str(row.get('org', '')),
-        str(row.get('asname', '')),
-        str(row.get('isp', ''))
-    ]).upper()
-
-    if 'AWS' in text or 'AMAZON' in text:
-        return 'AWS'
-    elif 'GOOGLE' in text or 'GCP' in text:
-        return 'Google Cloud'
-    elif 'AZURE' in text or 'MICROSOFT' in text:
-        return 'Azure'
-    elif 'HETZNER' in text:
-        return 'Hetzner'
-    elif 'OVH' in text:
-        return 'OVH'
-    elif 'DIGITALOCEAN' in text:
-        return 'DigitalOcean'
-    elif 'STARLINK' in text or 'SPACEX' in text:
-        return 'Starlink'
-    elif row.get('hosting', False):
-        return 'Other Cloud'
-    else:
-        return 'Home/ISP'
+# Provider keyword rules in priority order: (provider, uppercase regex)
+PROVIDER_RULES = [
+    ('AWS', 'AWS|AMAZON'),
+    ('Google Cloud', 'GOOGLE|GCP'),
+    ('Azure', 'AZURE|MICROSOFT'),
+    ('Hetzner', 'HETZNER'),
+    ('OVH', 'OVH'),
+    ('DigitalOcean', 'DIGITALOCEAN'),
+    ('Starlink', 'STARLINK|SPACEX'),
+]
+PROVIDER_CATEGORIES = [provider for provider, _ in PROVIDER_RULES] + ['Other Cloud', 'Home/ISP']
+
+# Alternation of every rule, used to find rows that match any provider in
+# a single scan
+_ANY_PROVIDER_PATTERN = '|'.join(pattern for _, pattern in PROVIDER_RULES)
+
+
+def _categorize_providers(df: pd.DataFrame) -> pd.Categorical:
+    """Simple provider categorization from org/asname/isp, for every row at once"""
+    text = pd.Series('', index=df.index)
+    for col in ('org', 'asname', 'isp'):
+        if col in df.columns:
+            text = text + ' ' + df[col].fillna('').astype(str)
+    text = text.str.upper()
+
+    # Rule positions line up with PROVIDER_CATEGORIES, so they are the
+    # category codes
+    codes = np.full(len(text), PROVIDER_CATEGORIES.index('Home/ISP'))
+    if 'hosting' in df.columns:
+        # Plain bool() per value, as in the original row-wise check:
+        # float NaN is truthy but None is not
+        hosting = df['hosting'].to_numpy(dtype=object)
+        hosting = np.fromiter(map(bool, hosting), dtype=bool, count=len(hosting))
+        codes[hosting] = PROVIDER_CATEGORIES.index('Other Cloud')
+
+    # One pass finds the rows matching any rule; only those go through the
+    # rule cascade. First matching rule wins, as in an if/elif chain, and
+    # each rule only scans rows no earlier rule claimed.
+    idx = np.flatnonzero(text.str.contains(_ANY_PROVIDER_PATTERN, regex=True).to_numpy())
+    matched = text.iloc[idx]
+    for code, (_, pattern) in enumerate(PROVIDER_RULES[:-1]):
+        hit = matched.str.contains(pattern, regex=True).to_numpy()
+        codes[idx[hit]] = code
+        idx, matched = idx[~hit], matched.iloc[~hit]
+    codes[idx] = len(PROVIDER_RULES) - 1
+
+    return pd.Categorical.from_codes(codes, categories=PROVIDER_CATEGORIES)
 
 
 def _interpret_pdi(pdi: float) -> str:
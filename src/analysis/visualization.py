@@ -5,25 +5,71 @@ Creates maps, charts, and dashboards to communicate
 geographic decentralization metrics.
 """
 
+import functools
+from itertools import chain
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import geopandas as gpd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, Union
 import h3
-from shapely.geometry import Polygon
-import pandas as pd
+import shapely
+
+# Prefer pyogrio over fiona for vector I/O when it is installed
+try:
+    import pyogrio  # noqa: F401
+    gpd.options.io_engine = "pyogrio"
+except ImportError:
+    pass
 
 # Set style
 sns.set_theme(style="whitegrid")
 plt.rcParams['figure.figsize'] = (12, 8)
 
 
+@functools.lru_cache(maxsize=1)
+def _world() -> gpd.GeoDataFrame:
+    """Load the Natural Earth basemap once and reuse it across plots"""
+    path = gpd.datasets.get_path('naturalearth_lowres')
+    if gpd.options.io_engine == "pyogrio":
+        try:
+            return gpd.read_file(path, use_arrow=True)
+        except ImportError:
+            # pyarrow not installed
+            pass
+    return gpd.read_file(path)
+
+
+@functools.lru_cache(maxsize=100_000)
+def _cell_boundary(cell_id: str) -> tuple:
+    """H3 cell boundary as (lat, lng) pairs, cached since cells recur across plots"""
+    return tuple(h3.cell_to_boundary(cell_id))
+
+
+def _finish_figure(
+    fig: plt.Figure,
+    save_path: Optional[str],
+    return_figure: bool
+) -> Union[plt.Figure, Optional[str]]:
+    """Save the figure if requested, then either return it or release it"""
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+
+    if return_figure:
+        return fig
+
+    # Closing frees the figure and its artists instead of keeping them
+    # alive in pyplot's figure manager until interpreter exit
+    plt.close(fig)
+    return save_path
+
+
 def plot_node_distribution_map(
     gdf: gpd.GeoDataFrame,
     title: str = "Node Geographic Distribution",
-    save_path: Optional[str] = None
-) -> plt.Figure:
+    save_path: Optional[str] = None,
+    return_figure: bool = False
+) -> Union[plt.Figure, Optional[str]]:
     """
     Create basic world map showing node locations
 
@@ -31,14 +77,16 @@ def plot_node_distribution_map(
         gdf: GeoDataFrame with node locations
         title: Plot title
         save_path: Optional path to save figure
+        return_figure: If True, keep the figure open and return it
+            (e.g. for notebooks); otherwise it is closed after saving
 
     Returns:
-        Matplotlib figure
+        Matplotlib figure if return_figure, else save_path
     """
     fig, ax = plt.subplots(figsize=(16, 10))
 
     # Load world map
-    world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
+    world = _world()
     world.plot(ax=ax, color='lightgray', edgecolor='white')
 
     # Plot nodes
@@ -58,18 +106,16 @@ def plot_node_distribution_map(
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    return fig
+    return _finish_figure(fig, save_path, return_figure)
 
 
 def plot_h3_heatmap(
     gdf: gpd.GeoDataFrame,
     resolution: int = 5,
     title: str = "Node Density Heatmap (H3)",
-    save_path: Optional[str] = None
-) -> plt.Figure:
+    save_path: Optional[str] = None,
+    return_figure: bool = False
+) -> Union[plt.Figure, Optional[str]]:
     """
     Create H3 hexagonal heatmap of node density
 
@@ -78,38 +124,52 @@ def plot_h3_heatmap(
         resolution: H3 resolution
         title: Plot title
         save_path: Optional path to save figure
+        return_figure: If True, keep the figure open and return it
+            (e.g. for notebooks); otherwise it is closed after saving
 
     Returns:
-        Matplotlib figure
+        Matplotlib figure if return_figure, else save_path
     """
-    # Convert to H3 cells
-    gdf['h3_cell'] = gdf.apply(
-        lambda row: h3.latlng_to_cell(row.geometry.y, row.geometry.x, resolution),
-        axis=1
-    )
+    # Convert to H3 cells (pull coordinates out once instead of a row-wise apply)
+    lats = gdf.geometry.y.to_numpy()
+    lons = gdf.geometry.x.to_numpy()
+    gdf['h3_cell'] = [
+        h3.latlng_to_cell(lat, lon, resolution) for lat, lon in zip(lats, lons)
+    ]
 
     # Count nodes per cell
     cell_counts = gdf['h3_cell'].value_counts()
 
-    # Create hexagon polygons for visualization
-    hexagons = []
-    for cell_id, count in cell_counts.items():
-        boundary = h3.cell_to_boundary(cell_id)
-        # H3 returns (lat, lng) but Shapely expects (lng, lat)
-        polygon = Polygon([(lng, lat) for lat, lng in boundary])
-        hexagons.append({
-            'h3_cell': cell_id,
-            'count': count,
-            'geometry': polygon
-        })
+    # Create hexagon polygons for visualization in one batched GEOS call.
+    # Boundaries are concatenated into a single coordinate array with a ring
+    # index per vertex (pentagons and distorted cells have != 6 vertices).
+    cell_ids = cell_counts.index.to_numpy()
+    boundaries = [_cell_boundary(cell_id) for cell_id in cell_ids]
+    ring_sizes = [len(boundary) for boundary in boundaries]
+
+    # Flatten the nested (lat, lng) tuples straight into one float buffer,
+    # skipping a per-boundary intermediate array.
+    # H3 returns (lat, lng) but Shapely expects (lng, lat)
+    coords = np.fromiter(
+        chain.from_iterable(chain.from_iterable(boundaries)),
+        dtype='f8',
+        count=2 * sum(ring_sizes)
+    ).reshape(-1, 2)[:, ::-1]
+    rings = shapely.linearrings(
+        coords, indices=np.repeat(np.arange(len(boundaries)), ring_sizes)
+    )
 
-    hex_gdf = gpd.GeoDataFrame(hexagons, crs='EPSG:4326')
+    hex_gdf = gpd.GeoDataFrame(
+        {'h3_cell': cell_ids, 'count': cell_counts.to_numpy()},
+        geometry=shapely.polygons(rings),
+        crs='EPSG:4326'
+    )
 
     # Plot
     fig, ax = plt.subplots(figsize=(16, 10))
 
     # World background
-    world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
+    world = _world()
     world.plot(ax=ax, color='lightgray', edgecolor='white', alpha=0.5)
 
     # Hexagon heatmap
@@ -130,17 +190,15 @@ def plot_h3_heatmap(
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    return fig
+    return _finish_figure(fig, save_path, return_figure)
 
 
 def plot_metric_summary(
     results: Dict[str, Any],
     network: str,
-    save_path: Optional[str] = None
-) -> plt.Figure:
+    save_path: Optional[str] = None,
+    return_figure: bool = False
+) -> Union[plt.Figure, Optional[str]]:
     """
     Create summary dashboard of all spatial metrics
 
@@ -148,9 +206,11 @@ def plot_metric_summary(
         results: Dictionary of metric results from compute_all_metrics()
         network: Network name
         save_path: Optional path to save figure
+        return_figure: If True, keep the figure open and return it
+            (e.g. for notebooks); otherwise it is closed after saving
 
     Returns:
-        Matplotlib figure
+        Matplotlib figure if return_figure, else save_path
     """
     fig = plt.figure(figsize=(16, 12))
     gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
@@ -273,17 +333,15 @@ def plot_metric_summary(
         family='monospace'
     )
 
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    return fig
+    return _finish_figure(fig, save_path, return_figure)
 
 
 def create_comparison_chart(
     results_dict: Dict[str, Dict[str, Any]],
     metric: str = 'spatial_hhi',
-    save_path: Optional[str] = None
-) -> plt.Figure:
+    save_path: Optional[str] = None,
+    return_figure: bool = False
+) -> Union[plt.Figure, Optional[str]]:
     """
     Compare a specific metric across multiple networks
 
@@ -291,9 +349,11 @@ def create_comparison_chart(
         results_dict: Dict mapping network name to results dict
         metric: Which metric to compare ('spatial_hhi', 'morans_i', etc.)
         save_path: Optional path to save figure
+        return_figure: If True, keep the figure open and return it
+            (e.g. for notebooks); otherwise it is closed after saving
 
     Returns:
-        Matplotlib figure
+        Matplotlib figure if return_figure, else save_path
     """
     networks = list(results_dict.keys())
     values = [results_dict[net][metric].value for net in networks]
@@ -338,7 +398,4 @@ def create_comparison_chart(
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    return fig
+    return _finish_figure(fig, save_path, return_figure)
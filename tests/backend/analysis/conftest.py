@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the src/analysis test suite
+
+The analysis modules are run as scripts from src/analysis and import each
+other by bare module name, so that directory goes on sys.path here.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+ANALYSIS_DIR = REPO_ROOT / 'src' / 'analysis'
+RAW_DIR = REPO_ROOT / 'data' / 'raw'
+
+sys.path.insert(0, str(ANALYSIS_DIR))
+
+
+@pytest.fixture(scope='session')
+def ethereum_nodes() -> pd.DataFrame:
+    """Ethereum node snapshot shipped in data/raw"""
+    return pd.read_csv(RAW_DIR / '2025-11-22-ethereum-ips.csv')
+
+
+@pytest.fixture(scope='session')
+def polygon_nodes() -> pd.DataFrame:
+    """Polygon node snapshot shipped in data/raw"""
+    return pd.read_csv(RAW_DIR / '2025-11-22-polygon-ips.csv')
+
+
+@pytest.fixture(scope='session')
+def fake_coordinates_to_cells():
+    """
+    Stand-in for h3ronpy's vectorized coordinates_to_cells
+
+    h3ronpy is optional; patching this into h3_index exercises the
+    vectorized branch of points_to_h3_uint64 with the cells h3-py assigns.
+    """
+    import h3.api.numpy_int as h3_int
+    import numpy as np
+
+    def coordinates_to_cells(lats, lons, resolution):
+        return np.array(
+            [h3_int.latlng_to_cell(lat, lon, resolution) for lat, lon in zip(lats, lons)],
+            dtype=np.uint64
+        )
+    return coordinates_to_cells
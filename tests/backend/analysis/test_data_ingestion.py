@@ -0,0 +1,107 @@
+"""Tests for the CSV loaders in data_ingestion.py"""
+
+import pandas as pd
+import pytest
+
+import data_ingestion
+
+NODES_CSV = """ip,lat,lon,country,city,isp,org
+1.1.1.1,52.5,13.4,Germany,Berlin,Hetzner,Hetzner Online GmbH
+2.2.2.2,,,France,,OVH,OVH SAS
+3.3.3.3,40.7,-74.0,United States,New York,Comcast,
+4.4.4.4,35.7,139.7,Japan,Tokyo,NTT,Amazon.com
+"""
+
+
+@pytest.fixture
+def nodes_csv(tmp_path):
+    path = tmp_path / 'nodes.csv'
+    path.write_text(NODES_CSV)
+    return path
+
+
+def test_read_node_csv_chunked_matches_full_read(nodes_csv):
+    full = data_ingestion.read_node_csv(str(nodes_csv)).dropna(subset=['lat', 'lon'])
+    chunked = data_ingestion.read_node_csv(str(nodes_csv), chunksize=1)
+
+    pd.testing.assert_frame_equal(chunked, full)
+
+
+def test_read_node_csv_header_only(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('ip,lat,lon,country,org\n')
+
+    full = data_ingestion.read_node_csv(str(path))
+    chunked = data_ingestion.read_node_csv(str(path), chunksize=10)
+
+    assert chunked.empty
+    pd.testing.assert_frame_equal(chunked, full)
+
+
+def test_load_from_csv_does_not_cache_by_default(nodes_csv):
+    gdf = data_ingestion.load_from_csv(str(nodes_csv))
+
+    assert len(gdf) == 3
+    assert list(nodes_csv.parent.iterdir()) == [nodes_csv]
+
+
+def test_load_from_csv_cache_roundtrip(nodes_csv, monkeypatch):
+    uncached = data_ingestion.load_from_csv(str(nodes_csv))
+    first = data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+    assert sorted(p.name for p in nodes_csv.parent.iterdir()) == ['nodes.csv', 'nodes.parquet']
+
+    # A fresh cache is served without parsing the CSV again
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV parsed despite a fresh cache")
+    monkeypatch.setattr(data_ingestion, 'read_node_csv', fail)
+    second = data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+
+    pd.testing.assert_frame_equal(first, uncached)
+    pd.testing.assert_frame_equal(second, uncached)
+
+
+def test_load_from_csv_rebuilds_stale_cache(nodes_csv):
+    data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+    nodes_csv.write_text(NODES_CSV + "5.5.5.5,48.9,2.3,France,Paris,Orange,\n")
+
+    gdf = data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+
+    assert len(gdf) == 4
+
+
+def test_load_from_csv_ignores_corrupt_cache(nodes_csv):
+    cache_path = nodes_csv.with_suffix('.parquet')
+    cache_path.write_bytes(b'PAR1 truncated')
+
+    gdf = data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+
+    assert len(gdf) == 3
+    # The corrupt file is replaced by a valid cache
+    assert len(data_ingestion.load_from_parquet(str(cache_path))) == 3
+
+
+def test_load_from_csv_chunksize_bypasses_cache(nodes_csv, monkeypatch):
+    data_ingestion.load_from_csv(str(nodes_csv), cache=True)
+    calls = []
+    read_node_csv = data_ingestion.read_node_csv
+
+    def spy(csv_path, columns=None, chunksize=None):
+        calls.append(chunksize)
+        return read_node_csv(csv_path, columns, chunksize)
+    monkeypatch.setattr(data_ingestion, 'read_node_csv', spy)
+
+    gdf = data_ingestion.load_from_csv(str(nodes_csv), chunksize=2, cache=True)
+
+    assert calls == [2]
+    assert len(gdf) == 3
+
+
+def test_mock_generators_agree_for_same_seed():
+    generator = data_ingestion.MockDataGenerator
+    snapshot = generator.generate_clustered_nodes('ethereum', num_nodes=60, num_clusters=4, seed=7)
+
+    expected = data_ingestion.snapshot_to_geodataframe(snapshot)
+    gdf = generator.generate_clustered_gdf('ethereum', num_nodes=60, num_clusters=4, seed=7)
+
+    assert len(gdf) == 60
+    pd.testing.assert_frame_equal(gdf, expected)
@@ -0,0 +1,121 @@
+"""Regression tests for gdi.py, pinned to the pre-optimization outputs"""
+
+import h3
+import numpy as np
+import pandas as pd
+import pytest
+
+import gdi
+import h3_index
+
+# Category sizes whose shares of 2000 land on x.x5 ties, where round() and
+# np.round disagree (e.g. 501 / 2000 -> 25.05)
+TIE_COUNTS = [501, 441, 437, 321, 300]
+
+
+def test_calculate_gdi_pinned_sample(ethereum_nodes):
+    sample = ethereum_nodes.sample(3000, random_state=1)
+    np.random.seed(0)
+
+    result = gdi.calculate_gdi(sample)
+
+    assert result['pdi']['pdi'] == 59.8
+    assert result['jdi']['jdi'] == 85.3
+    assert result['ihi']['ihi'] == 98.3
+    # Unrounded composite is 78.35; it has always rounded like np.round
+    assert result['gdi'] == 78.4
+    assert result['interpretation'] == 'Moderately decentralized'
+
+
+def test_top_shares_round_like_builtin_round():
+    labels = np.repeat(['C0', 'C1', 'C2', 'C3', 'C4'], TIE_COUNTS)
+
+    jdi = gdi.calculate_jdi(pd.DataFrame({'country': labels}))
+    ihi = gdi.calculate_ihi(pd.DataFrame({'org': labels}))
+
+    expected = {
+        'C0': {'count': 501, 'share': 25.1},
+        'C1': {'count': 441, 'share': 22.1},
+        'C2': {'count': 437, 'share': 21.9},
+    }
+    assert jdi['top_3_countries'] == expected
+    assert ihi['top_3_orgs'] == expected
+    assert (jdi['jdi'], jdi['country_hhi']) == (79.3, 0.207)
+    assert (ihi['ihi'], ihi['org_hhi']) == (79.3, 0.207)
+
+
+def _interpret_pdi_chain(pdi):
+    if pdi >= 80:
+        return "Highly dispersed"
+    elif pdi >= 60:
+        return "Moderately dispersed"
+    else:
+        return "Concentrated"
+
+
+def _interpret_hhi_based_chain(score):
+    if score >= 75:
+        return "Low concentration"
+    elif score >= 50:
+        return "Moderate concentration"
+    elif score >= 25:
+        return "High concentration"
+    else:
+        return "Very high concentration"
+
+
+def _interpret_gdi_chain(gdi_score):
+    if gdi_score >= 80:
+        return "Highly decentralized"
+    elif gdi_score >= 60:
+        return "Moderately decentralized"
+    elif gdi_score >= 40:
+        return "Weakly decentralized"
+    else:
+        return "Centralized"
+
+
+@pytest.mark.parametrize('interpret, chain', [
+    (gdi._interpret_pdi, _interpret_pdi_chain),
+    (gdi._interpret_hhi_based, _interpret_hhi_based_chain),
+    (gdi._interpret_gdi, _interpret_gdi_chain),
+])
+def test_interpret_matches_threshold_chain(interpret, chain):
+    # Band edges, values just below them, and out-of-range scores
+    scores = [
+        np.nan, -np.inf, -1.0, 0.0, 24.99, 25.0, 39.99, 40.0, 49.99, 50.0,
+        59.99, 60.0, 74.99, 75.0, 79.99, 80.0, 100.0, np.inf
+    ]
+
+    assert [interpret(score) for score in scores] == [chain(score) for score in scores]
+    assert interpret(np.array(scores)).tolist() == [chain(score) for score in scores]
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_h3_cell_counts_match_string_cells(polygon_nodes, fake_coordinates_to_cells, monkeypatch, vectorized):
+    nodes = polygon_nodes.dropna(subset=['lat', 'lon'])
+    gdf = gdi._to_geodataframe(nodes['lat'].to_numpy(), nodes['lon'].to_numpy())
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', fake_coordinates_to_cells if vectorized else None)
+
+    counts = gdi._h3_cell_counts(gdf, 5)
+
+    # Original histogram over h3-py cell strings, in first-seen cell order
+    cells = [h3.latlng_to_cell(lat, lon, 5) for lat, lon in zip(nodes['lat'], nodes['lon'])]
+    expected = pd.Series(cells).value_counts(sort=False)
+    np.testing.assert_array_equal(counts, expected.to_numpy())
+
+
+def test_category_counts_with_mask_in_first_appearance_order():
+    values = pd.Series(['DE', 'US', None, 'FR', 'US', 'DE', 'JP', 'FR', 'US', None, 'BR'])
+    mask = np.array([False, True, True, False, True, True, False, True, True, True, False])
+
+    labels, counts = gdi._category_counts(values, mask)
+
+    # Selected rows: US, None, US, DE, FR, US, None
+    assert labels.tolist() == ['US', 'DE', 'FR']
+    assert counts.tolist() == [3, 1, 1]
+
+
+def test_calculate_pdi_requires_points():
+    with pytest.raises(ValueError):
+        gdi.calculate_pdi()
@@ -0,0 +1,64 @@
+"""Tests for gdi_standalone.py"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import gdi_standalone
+import spatial_weights
+
+
+def test_concentration_indices_skip_missing_values():
+    df = pd.DataFrame({
+        'country': ['US', 'US', 'DE', None, 'FR', np.nan, 'US', 'DE'],
+        'org': ['Amazon', None, 'Hetzner', 'Amazon', np.nan, 'OVH', 'Amazon', 'Hetzner'],
+    })
+
+    jdi = gdi_standalone.calculate_jdi(df)
+    ihi = gdi_standalone.calculate_ihi(df)
+
+    # Missing labels are not a category, but still count toward the total
+    assert jdi['num_countries'] == 3
+    assert jdi['top_3_countries'] == {
+        'US': {'count': 3, 'share': 37.5},
+        'DE': {'count': 2, 'share': 25.0},
+        'FR': {'count': 1, 'share': 12.5},
+    }
+    assert (jdi['jdi'], jdi['country_hhi']) == (9.3, 0.219)
+    assert ihi['num_orgs'] == 3
+    assert list(ihi['top_3_orgs']) == ['Amazon', 'Hetzner', 'OVH']
+    assert (ihi['ihi'], ihi['org_hhi']) == (-42.8, 0.219)
+
+
+def test_import_skips_geo_stack():
+    # Standalone on purpose: only the lightweight weights module is shared
+    script = (
+        "import sys\n"
+        "import gdi_standalone\n"
+        "print(sorted(m for m in ('geopandas', 'sklearn', 'spatial_metrics', 'simple_metrics')"
+        " if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=Path(gdi_standalone.__file__).parent,
+        capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '[]'
+
+
+def test_morans_i_reuses_weights_tree(polygon_nodes):
+    nodes = polygon_nodes.dropna(subset=['lat', 'lon']).head(300)
+    x, y = gdi_standalone._TO_MOLLWEIDE.transform(nodes['lon'].to_numpy(), nodes['lat'].to_numpy())
+    coords = np.column_stack([x, y])
+
+    gdi_standalone._calculate_morans_i(coords, 500.0)
+    hits = spatial_weights._cached_kdtree.cache_info().hits
+    gdi_standalone._calculate_morans_i(coords, 250.0)
+
+    # New threshold, new weights: the tree still comes from the cache, once
+    # for the weights and once for the density
+    assert spatial_weights._cached_kdtree.cache_info().hits == hits + 2
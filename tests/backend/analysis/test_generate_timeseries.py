@@ -0,0 +1,25 @@
+"""Tests for generate_timeseries.py"""
+
+import numpy as np
+
+import generate_timeseries as gt
+
+CURRENT = {'morans_i': 0.4043, 'spatial_hhi': 0.0184, 'enl': 237.5, 'ann': 0.073}
+
+
+def test_vectorized_series_match_per_metric_generators():
+    series = gt._build_all_series(CURRENT, 30, np.random.default_rng(5))
+
+    # Same generator state consumed metric by metric, in SERIES_SPECS order
+    rng = np.random.default_rng(5)
+    expected = {
+        'morans_i': gt.generate_morans_i_series(CURRENT['morans_i'], 30, rng),
+        'spatial_hhi': gt.generate_spatial_hhi_series(CURRENT['spatial_hhi'], 30, rng),
+        'enl': gt.generate_enl_series(CURRENT['enl'], 30, rng),
+        'ann': gt.generate_ann_series(CURRENT['ann'], 30, rng),
+    }
+
+    assert list(series) == list(expected) == list(gt.SERIES_SPECS)
+    for name, values in expected.items():
+        np.testing.assert_allclose(series[name], values, rtol=1e-12)
+        assert series[name][-1] == CURRENT[name]
@@ -0,0 +1,31 @@
+"""Tests for h3_index.py"""
+
+import h3
+import numpy as np
+import pytest
+
+import h3_index
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_points_to_h3_uint64_matches_h3_strings(polygon_nodes, fake_coordinates_to_cells, monkeypatch, vectorized):
+    nodes = polygon_nodes.dropna(subset=['lat', 'lon'])
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', fake_coordinates_to_cells if vectorized else None)
+
+    cells = h3_index.points_to_h3_uint64(nodes['lat'], nodes['lon'], 5)
+
+    assert cells.dtype == np.uint64
+    expected = [h3.latlng_to_cell(lat, lon, 5) for lat, lon in zip(nodes['lat'], nodes['lon'])]
+    assert [h3.int_to_str(int(cell)) for cell in cells] == expected
+
+
+def test_h3ronpy_matches_h3(polygon_nodes):
+    pytest.importorskip('h3ronpy')
+    if h3_index.coordinates_to_cells is None:
+        pytest.skip('h3ronpy has no coordinates_to_cells')
+    nodes = polygon_nodes.dropna(subset=['lat', 'lon'])
+
+    cells = h3_index.points_to_h3_uint64(nodes['lat'], nodes['lon'], 5)
+
+    expected = [h3.latlng_to_cell(lat, lon, 5) for lat, lon in zip(nodes['lat'], nodes['lon'])]
+    assert [h3.int_to_str(int(cell)) for cell in cells] == expected
@@ -0,0 +1,25 @@
+"""Tests for json_utils.py"""
+
+import json
+
+import numpy as np
+import pytest
+
+import json_utils
+
+DATA = {'network': 'ethereum', 'gdi': np.float64(78.4), 'top': {'US': [3, 37.5]}, 'cells': []}
+
+
+@pytest.mark.parametrize('indent', [True, False])
+def test_write_json_same_output_with_and_without_orjson(tmp_path, monkeypatch, indent):
+    pytest.importorskip('orjson')
+    json_utils.write_json(tmp_path / 'orjson.json', DATA, indent=indent)
+    monkeypatch.setattr(json_utils, 'orjson', None)
+    json_utils.write_json(tmp_path / 'stdlib.json', DATA, indent=indent)
+
+    written = (tmp_path / 'orjson.json').read_text()
+    assert json.loads(written) == DATA
+    if indent:
+        assert written == (tmp_path / 'stdlib.json').read_text()
+    else:
+        assert json.loads((tmp_path / 'stdlib.json').read_text()) == DATA
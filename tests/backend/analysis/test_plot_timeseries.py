@@ -0,0 +1,39 @@
+"""Tests for plot_timeseries.py"""
+
+import json
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+import plot_timeseries  # noqa: E402
+
+
+def _write_series(path, rows):
+    path.write_text(json.dumps({'network': 'ethereum', 'data': rows}))
+    return path
+
+
+@pytest.mark.parametrize('scale, expected', [
+    # Unchanged metrics: Moran's I and HHI read as increases, ENL and ANN as decreases
+    (1.0, ['↑ More clustered', '↑ More concentrated', '↓ Less diverse', '↓ More clustered']),
+    (0.5, ['↓ Less clustered', '↓ Less concentrated', '↓ Less diverse', '↓ More clustered']),
+    (2.0, ['↑ More clustered', '↑ More concentrated', '↑ More diverse', '↑ More dispersed']),
+])
+def test_dashboard_trend_annotations(tmp_path, scale, expected):
+    first = {'morans_i': 0.4, 'spatial_hhi': 0.02, 'enl': 200.0, 'ann': 0.07}
+    rows = [
+        {'date_str': '2025-11-01', **first},
+        {'date_str': '2025-11-02', **{col: value * scale for col, value in first.items()}},
+    ]
+
+    fig = plot_timeseries.plot_timeseries_dashboard(_write_series(tmp_path / 'ts.json', rows))
+    try:
+        annotations = [ax.texts[0].get_text().split('\n')[1] for ax in fig.axes]
+    finally:
+        plt.close(fig)
+
+    assert annotations == expected
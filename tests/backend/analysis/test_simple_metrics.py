@@ -0,0 +1,107 @@
+"""Regression tests for simple_metrics.py"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import h3
+import numpy as np
+import pandas as pd
+
+import h3_index
+import simple_metrics
+
+
+def _categorize_provider_row(row) -> str:
+    """Original row-wise categorization, kept as the reference behaviour"""
+    text = ' '.join([
+        str(row.get('org', '')),
+        str(row.get('asname', '')),
+        str(row.get('isp', ''))
+    ]).upper()
+
+    if 'AWS' in text or 'AMAZON' in text:
+        return 'AWS'
+    elif 'GOOGLE' in text or 'GCP' in text:
+        return 'Google Cloud'
+    elif 'AZURE' in text or 'MICROSOFT' in text:
+        return 'Azure'
+    elif 'HETZNER' in text:
+        return 'Hetzner'
+    elif 'OVH' in text:
+        return 'OVH'
+    elif 'DIGITALOCEAN' in text:
+        return 'DigitalOcean'
+    elif 'STARLINK' in text or 'SPACEX' in text:
+        return 'Starlink'
+    elif row.get('hosting', False):
+        return 'Other Cloud'
+    else:
+        return 'Home/ISP'
+
+
+def test_categorize_providers_matches_row_wise(polygon_nodes):
+    expected = polygon_nodes.apply(_categorize_provider_row, axis=1).tolist()
+    assert list(simple_metrics._categorize_providers(polygon_nodes)) == expected
+
+
+def test_categorize_providers_hosting_none_vs_nan():
+    df = pd.DataFrame({
+        'org': ['Comcast'] * 4 + ['Microsoft Amazon'],
+        'hosting': pd.Series([None, np.nan, True, False, None], dtype=object),
+    })
+
+    providers = list(simple_metrics._categorize_providers(df))
+
+    # bool(None) is False, bool(NaN) is True; provider rules win over hosting
+    assert providers == ['Home/ISP', 'Other Cloud', 'Other Cloud', 'Home/ISP', 'AWS']
+    assert providers == df.apply(_categorize_provider_row, axis=1).tolist()
+
+
+def _calculate_pdi_strings(df, h3_resolution=5):
+    """Original PDI on h3-py cell strings, kept as the reference behaviour"""
+    cells = [h3.latlng_to_cell(lat, lon, h3_resolution) for lat, lon in zip(df['lat'], df['lon'])]
+    cell_counts = pd.Series(cells).value_counts()
+    shares = cell_counts / len(df)
+    spatial_hhi = (shares ** 2).sum()
+    pdi = 100 * (1 - spatial_hhi)
+    return {
+        'pdi': round(pdi, 1),
+        'spatial_hhi': round(spatial_hhi, 3),
+        'num_cells': len(cell_counts),
+        'max_cell_share': round(shares.max() * 100, 1),
+        'interpretation': simple_metrics._interpret_pdi(pdi)
+    }
+
+
+def test_calculate_pdi_matches_string_cells(ethereum_nodes, fake_coordinates_to_cells, monkeypatch):
+    nodes = ethereum_nodes.dropna(subset=['lat', 'lon']).sample(2000, random_state=0)
+    expected = _calculate_pdi_strings(nodes)
+
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', None)
+    assert simple_metrics.calculate_pdi(nodes) == expected
+
+    # Same result through the vectorized (h3ronpy) branch
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', fake_coordinates_to_cells)
+    assert simple_metrics.calculate_pdi(nodes) == expected
+
+
+def test_top_provider_shares_round_like_builtin_round():
+    # Shares of 2000 land on x.x5 ties, where round() and np.round disagree
+    orgs = np.repeat(['Amazon', 'Google', 'Microsoft', 'Hetzner', 'OVH'], [501, 441, 437, 321, 300])
+
+    ihi = simple_metrics.calculate_ihi(pd.DataFrame({'org': orgs}))
+
+    assert ihi['top_3_providers'] == {'AWS': 25.1, 'Google Cloud': 22.1, 'Azure': 21.9}
+    assert all(type(share) is float for share in ihi['top_3_providers'].values())
+
+
+def test_import_skips_numba():
+    # spatial_metrics imports this module, so every entry point would pay for it
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, simple_metrics; print('numba' in sys.modules)"],
+        cwd=Path(simple_metrics.__file__).parent, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False'
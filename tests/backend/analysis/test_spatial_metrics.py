@@ -0,0 +1,185 @@
+"""Tests for spatial_metrics.py and the PDI paths built on it"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import h3
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neighbors import KernelDensity
+
+import gdi
+import h3_index
+import spatial_metrics
+from spatial_metrics import SpatialAnalyzer, global_morans_i
+from spatial_weights import distance_band_weights
+
+
+@pytest.fixture(scope='module')
+def polygon_gdf(polygon_nodes):
+    nodes = polygon_nodes.dropna(subset=['lat', 'lon']).head(300)
+    return gdi._to_geodataframe(nodes['lat'].to_numpy(), nodes['lon'].to_numpy())
+
+
+@pytest.fixture(scope='module')
+def polygon_coords(polygon_gdf):
+    """Projected (Mollweide) coordinates in meters"""
+    projected = polygon_gdf.to_crs('ESRI:54009')
+    return np.column_stack([projected.geometry.x, projected.geometry.y])
+
+
+def test_gdi_pdi_uses_analyzer_morans_i(polygon_gdf):
+    np.random.seed(0)
+    pdi = gdi.calculate_pdi(gdf=polygon_gdf)
+    np.random.seed(0)
+    result = SpatialAnalyzer(polygon_gdf).morans_i(threshold_km=500)
+
+    assert pdi['morans_i'] == round(result.value, 3)
+    assert pdi['morans_p_value'] == round(result.p_value, 4)
+
+
+def test_distance_band_weights_cached_and_read_only(polygon_coords):
+    W = distance_band_weights(polygon_coords, 500_000)
+
+    assert distance_band_weights(polygon_coords.copy(), 500_000) is W
+    assert not W.data.flags.writeable
+    row_sums = np.asarray(W.sum(axis=1)).ravel()
+    np.testing.assert_allclose(row_sums[row_sums > 0], 1.0)
+
+
+def test_distance_band_weights_match_pysal(polygon_coords):
+    libpysal = pytest.importorskip('libpysal')
+    # Sample has many coincident nodes (shared geolocations); DistanceBand
+    # does not treat them as neighbors
+    W_pysal = libpysal.weights.DistanceBand(
+        polygon_coords, threshold=500_000, binary=True, silence_warnings=True
+    )
+    W_pysal.transform = 'r'
+    expected = W_pysal.sparse.toarray()
+
+    W = distance_band_weights(polygon_coords, 500_000)
+
+    np.testing.assert_allclose(W.toarray(), expected)
+    with_coincident = distance_band_weights(polygon_coords, 500_000, include_coincident=True)
+    assert with_coincident.nnz > W.nnz
+
+
+def test_pdi_paths_share_weights(polygon_gdf, polygon_coords):
+    np.random.seed(0)
+    result = SpatialAnalyzer(polygon_gdf).morans_i(threshold_km=500)
+    W = distance_band_weights(polygon_coords, 500_000)
+    assert result.metadata['n_neighbors_mean'] == np.diff(W.indptr).mean()
+
+
+def test_global_morans_i_matches_esda(polygon_coords):
+    esda = pytest.importorskip('esda')
+    libpysal = pytest.importorskip('libpysal')
+    x = polygon_coords[:, 1] + np.random.default_rng(0).normal(0, 1e5, len(polygon_coords))
+    W_pysal = libpysal.weights.DistanceBand(
+        polygon_coords, threshold=500_000, binary=True, silence_warnings=True
+    )
+
+    np.random.seed(0)
+    expected = esda.Moran(x, W_pysal, permutations=999)
+    np.random.seed(0)
+    I, p_sim = global_morans_i(x, distance_band_weights(polygon_coords, 500_000))
+
+    assert I == pytest.approx(expected.I, rel=1e-12)
+    assert p_sim == expected.p_sim
+
+
+def _string_cell_counts(gdf, resolution):
+    """Original per-row h3-py cell strings, counted"""
+    cells = [h3.latlng_to_cell(point.y, point.x, resolution) for point in gdf.geometry]
+    return pd.Series(cells).value_counts()
+
+
+def test_h3_cells_match_string_cells(polygon_gdf):
+    analyzer = SpatialAnalyzer(polygon_gdf)
+
+    cells = analyzer._h3_cells(5)
+
+    assert cells.dtype == np.uint64
+    expected = [h3.latlng_to_cell(point.y, point.x, 5) for point in polygon_gdf.geometry]
+    assert [h3.int_to_str(int(cell)) for cell in cells] == expected
+
+
+def test_h3_metrics_match_string_cells(polygon_gdf):
+    counts = _string_cell_counts(polygon_gdf, 5)
+    shares = counts / len(polygon_gdf)
+
+    analyzer = SpatialAnalyzer(polygon_gdf)
+    hhi = analyzer.spatial_hhi(resolution=5)
+    enl = analyzer.effective_num_locations(resolution=5)
+
+    assert hhi.value == pytest.approx((shares ** 2).sum(), rel=1e-12)
+    assert enl.value == pytest.approx(np.exp(-np.sum(shares * np.log(shares))), rel=1e-12)
+
+
+def test_h3_vectorized_branch_parity(polygon_gdf, fake_coordinates_to_cells, monkeypatch):
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', None)
+    analyzer = SpatialAnalyzer(polygon_gdf)
+    cells = analyzer._h3_cells(5)
+    hhi, enl = analyzer.spatial_hhi(resolution=5), analyzer.effective_num_locations(resolution=5)
+
+    monkeypatch.setattr(h3_index, 'coordinates_to_cells', fake_coordinates_to_cells)
+    vectorized = SpatialAnalyzer(polygon_gdf)
+
+    np.testing.assert_array_equal(vectorized._h3_cells(5), cells)
+    assert vectorized.spatial_hhi(resolution=5).value == hhi.value
+    assert vectorized.effective_num_locations(resolution=5).value == enl.value
+
+
+def test_small_n_density_matches_kernel_density(polygon_gdf, polygon_coords):
+    assert len(polygon_coords) <= spatial_metrics.SMALL_KDE_NODES
+    kde = KernelDensity(bandwidth=100_000, kernel='gaussian').fit(polygon_coords)
+    expected = np.exp(kde.score_samples(polygon_coords))
+
+    density = SpatialAnalyzer(polygon_gdf)._calculate_local_density(bandwidth_km=100)
+
+    np.testing.assert_allclose(density, expected, rtol=1e-8)
+
+
+def test_tree_density_matches_exact(polygon_gdf, monkeypatch):
+    analyzer = SpatialAnalyzer(polygon_gdf)
+    exact = analyzer._calculate_local_density(bandwidth_km=100)
+
+    monkeypatch.setattr(spatial_metrics, 'SMALL_KDE_NODES', 0)
+    approximate = analyzer._calculate_local_density(bandwidth_km=100)
+
+    np.testing.assert_allclose(approximate, exact, rtol=1e-7)
+
+
+def test_moran_normal_moments_match_esda(polygon_coords):
+    esda = pytest.importorskip('esda')
+    libpysal = pytest.importorskip('libpysal')
+    x = polygon_coords[:, 0] + np.random.default_rng(1).normal(0, 1e5, len(polygon_coords))
+    W_pysal = libpysal.weights.DistanceBand(
+        polygon_coords, threshold=500_000, binary=True, silence_warnings=True
+    )
+    expected = esda.Moran(x, W_pysal, permutations=0)
+
+    EI, VI_norm = spatial_metrics._moran_normal_moments(distance_band_weights(polygon_coords, 500_000))
+
+    assert EI == pytest.approx(expected.EI, rel=1e-12)
+    assert VI_norm == pytest.approx(expected.VI_norm, rel=1e-10)
+
+
+def test_compute_all_metrics_lets_interpreter_exit():
+    # Run in a fresh interpreter: numba's parallel pool, once started from a
+    # worker thread, blocks exit rather than failing the call
+    script = (
+        "from data_ingestion import MockDataGenerator\n"
+        "from spatial_metrics import SpatialAnalyzer\n"
+        "gdf = MockDataGenerator.generate_clustered_gdf('ethereum', num_nodes=200, seed=0)\n"
+        "print(sorted(SpatialAnalyzer(gdf).compute_all_metrics()))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=Path(spatial_metrics.__file__).parent,
+        capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "['ann', 'enl', 'morans_i', 'spatial_hhi']"